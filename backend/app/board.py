@@ -0,0 +1,147 @@
+# backend/app/board.py
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.orm import Session, aliased
+
+from . import board_stream, models, schemas
+
+# Keep this many versions of board_change history per event; compact once the
+# floor can move up by BOARD_LOG_COMPACT_EVERY. Registration changes bump the
+# version without logging here, so multiples of it may never be seen.
+# Clients behind the floor get a snapshot.
+BOARD_LOG_RETENTION = 1000
+BOARD_LOG_COMPACT_EVERY = 100
+
+
+def board_query(event_id: int, table_ids: Optional[Iterable[int]] = None):
+    """Build the single statement behind the table board.
+
+    table LEFT JOIN active assignment LEFT JOIN player1 / player2, so the
+    whole board costs one round trip no matter how many tables are occupied.
+    """
+    p1 = aliased(models.Player, name="p1")
+    p2 = aliased(models.Player, name="p2")
+    stmt = (
+        select(models.Table, models.Assignment, p1, p2)
+        .outerjoin(
+            models.Assignment,
+            and_(
+                models.Assignment.id == models.Table.current_assignment_id,
+                models.Assignment.status == "active",
+            ),
+        )
+        .outerjoin(p1, p1.id == models.Assignment.player1_id)
+        .outerjoin(p2, p2.id == models.Assignment.player2_id)
+        .where(models.Table.event_id == event_id)
+        .order_by(models.Table.id)
+    )
+    if table_ids is not None:
+        stmt = stmt.where(models.Table.id.in_(list(table_ids)))
+    return stmt
+
+
+def board_row(
+    t: models.Table,
+    a: Optional[models.Assignment],
+    p1: Optional[models.Player],
+    p2: Optional[models.Player],
+) -> schemas.TableBoardRow:
+    return schemas.TableBoardRow(
+        id=t.id,
+        position=t.position,
+        status=t.status,
+        label=f"Table {t.position}" if t.position is not None else f"Table {t.id}",
+        current_assignment_id=t.current_assignment_id,
+        assignment_status=a.status if a else None,
+        assignment_created_at=a.created_at if a else None,
+        started_at=a.started_at if a else None,
+        notified_at=a.notified_at if a else None,
+        ended_at=a.ended_at if a else None,
+        player1=p1,
+        player2=p2,
+    )
+
+
+def board_rows(
+    db: Session, event_id: int, table_ids: Optional[Iterable[int]] = None
+) -> List[schemas.TableBoardRow]:
+    result = db.execute(board_query(event_id, table_ids))
+    return [board_row(t, a, p1, p2) for t, a, p1, p2 in result]
+
+
+def record_board_change(db: Session, event_id: int, table_ids: Optional[Iterable[int]] = None) -> int:
+    """Bump the event version and publish the changed tables to live viewers.
+
+    Call this after the mutation, before commit. Pass ``table_ids=None`` for
+    structural changes (tables created or deleted) to make viewers refetch.
+    Returns the new event version.
+    """
+    # bump_event_version, also reading how far the log was compacted.
+    version, floor = db.execute(
+        update(models.Event)
+        .where(models.Event.id == event_id)
+        .values(state_version=models.Event.state_version + 1)
+        .returning(models.Event.state_version, models.Event.changes_floor)
+    ).one()
+    rows = None
+    if table_ids is None:
+        db.add(models.BoardChange(event_id=event_id, version=version, table_id=None))
+    else:
+        table_ids = set(table_ids)
+        db.add_all(
+            models.BoardChange(event_id=event_id, version=version, table_id=table_id)
+            for table_id in table_ids
+        )
+        db.flush()
+        rows = board_rows(db, event_id, table_ids)
+    if version - BOARD_LOG_RETENTION - floor >= BOARD_LOG_COMPACT_EVERY:
+        compact_board_changes(db, event_id, version - BOARD_LOG_RETENTION)
+    board_stream.publish(db, event_id, version, rows)
+    return version
+
+
+def compact_board_changes(db: Session, event_id: int, floor: int) -> None:
+    """Drop change-log rows at or below ``floor`` and remember the cut-off."""
+    if floor <= 0:
+        return
+    db.execute(
+        delete(models.BoardChange).where(
+            models.BoardChange.event_id == event_id,
+            models.BoardChange.version <= floor,
+        )
+    )
+    db.execute(
+        update(models.Event)
+        .where(models.Event.id == event_id, models.Event.changes_floor < floor)
+        .values(changes_floor=floor)
+    )
+
+
+def board_changes_since(db: Session, event_id: int, since: int, version: int, floor: int) -> schemas.TableChangesOut:
+    """Rows for the tables that changed after ``since``, or a full snapshot.
+
+    A snapshot is returned when the cursor is older than the compacted log,
+    ahead of the server, or when a structural change happened meanwhile.
+    """
+    if since == version:
+        return schemas.TableChangesOut(version=version, full=False)
+    if since < floor or since > version:
+        return schemas.TableChangesOut(version=version, full=True, tables=board_rows(db, event_id))
+
+    changed = {
+        table_id
+        for (table_id,) in db.query(models.BoardChange.table_id)
+        .filter(models.BoardChange.event_id == event_id, models.BoardChange.version > since)
+        .distinct()
+    }
+    if None in changed:
+        return schemas.TableChangesOut(version=version, full=True, tables=board_rows(db, event_id))
+
+    rows = board_rows(db, event_id, changed) if changed else []
+    return schemas.TableChangesOut(
+        version=version,
+        full=False,
+        tables=rows,
+        removed=sorted(changed - {row.id for row in rows}),
+    )
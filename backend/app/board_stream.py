@@ -0,0 +1,125 @@
+# backend/app/board_stream.py
+"""Live board updates pushed to desk and TV screens as Server-Sent Events."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import pubsub, schemas
+
+CHANNEL = "board_changes"
+KEEPALIVE_SECONDS = 15.0
+QUEUE_SIZE = 100
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7900
+
+Frame = Tuple[int, str]
+
+_subscribers: Dict[int, Set["asyncio.Queue[Frame]"]] = {}
+
+
+def publish(
+    db: Session,
+    event_id: int,
+    version: int,
+    rows: Optional[List[schemas.TableBoardRow]],
+) -> None:
+    """Queue a board delta for delivery when ``db`` commits.
+
+    ``rows`` holds the new state of every changed table; ``None`` (or a
+    delta too large for one notification) tells viewers to refetch the board.
+    """
+    message = {"event_id": event_id, "version": version, "resync": rows is None}
+    if rows is not None:
+        message["tables"] = [row.model_dump(mode="json") for row in rows]
+    payload = json.dumps(message, separators=(",", ":"))
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        payload = json.dumps({"event_id": event_id, "version": version, "resync": True})
+    pubsub.notify(db, CHANNEL, payload)
+
+
+def _frame(kind: str, version: int, data: str) -> str:
+    return f"id: {version}\nevent: {kind}\ndata: {data}\n\n"
+
+
+def _offer(queue: "asyncio.Queue[Frame]", item: Frame) -> None:
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        # A viewer that cannot keep up gets one resync instead of a backlog.
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait((item[0], _frame("resync", item[0], json.dumps({"version": item[0]}))))
+
+
+def _on_message(payload: str) -> None:
+    message = json.loads(payload)
+    queues = _subscribers.get(message["event_id"])
+    if not queues:
+        return
+    version = message["version"]
+    # Format once, fan out the same string to every viewer of this event.
+    frame = (version, _frame("resync" if message.get("resync") else "delta", version, payload))
+    for queue in queues:
+        _offer(queue, frame)
+
+
+def _on_reconnect() -> None:
+    for queues in _subscribers.values():
+        for queue in queues:
+            _offer(queue, (0, _frame("resync", 0, json.dumps({"version": None}))))
+
+
+pubsub.subscribe(CHANNEL, _on_message)
+pubsub.on_reconnect(_on_reconnect)
+
+
+def subscribe(event_id: int) -> "asyncio.Queue[Frame]":
+    queue: "asyncio.Queue[Frame]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _subscribers.setdefault(event_id, set()).add(queue)
+    return queue
+
+
+def unsubscribe(event_id: int, queue: "asyncio.Queue[Frame]") -> None:
+    queues = _subscribers.get(event_id)
+    if queues is None:
+        return
+    queues.discard(queue)
+    if not queues:
+        del _subscribers[event_id]
+
+
+async def stream(
+    event_id: int,
+    queue: "asyncio.Queue[Frame]",
+    version: int,
+    snapshot: List[schemas.TableBoardRow],
+) -> AsyncIterator[str]:
+    """Yield the snapshot, then deltas newer than it, until the client leaves.
+
+    The queue must be subscribed before the snapshot is read so that no
+    change committed in between is lost; deltas already reflected in the
+    snapshot are skipped by version.
+    """
+    try:
+        data = json.dumps(
+            {"event_id": event_id, "version": version, "tables": [row.model_dump(mode="json") for row in snapshot]},
+            separators=(",", ":"),
+        )
+        yield _frame("snapshot", version, data)
+        while True:
+            try:
+                frame_version, frame = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if frame_version and frame_version <= version:
+                continue
+            version = max(version, frame_version)
+            yield frame
+    finally:
+        unsubscribe(event_id, queue)
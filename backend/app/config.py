@@ -1,4 +1,6 @@
 # backend/app/config.py
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -12,4 +14,44 @@ class Settings(BaseSettings):
 
     FRONTEND_ORIGINS: str = "http://localhost:5173"  # comma-separated if multiple
 
+    # Schema handling at worker startup (app/migrations): "migrate" applies pending
+    # migrations, "create_all" is the old dev shortcut, "none" leaves it to the
+    # deploy step (python -m app.migrations) - use that in production.
+    DB_STARTUP_SCHEMA: Literal["migrate", "create_all", "none"] = "migrate"
+
+    # Connection pools (app/db.py), applied to the sync and the async engine alike.
+    # Each worker may open 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) + 1 (pubsub) connections,
+    # and as many again on the replica when DATABASE_REPLICA_URL is set.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # replace connections older than this many seconds; -1 never
+    DB_POOL_PRE_PING: bool = True  # test each checkout with a round trip; off relies on recycle
+    # With DATABASE_REPLICA_URL set, a client that just wrote reads from the primary this long
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Cache of bearer token -> agent identity (app/security.py); 0 disables it
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_SIZE: int = 1024
+    PASSWORD_HASH_WORKERS: int = 2  # dedicated bcrypt threads (app/hashing.py)
+    PASSWORD_HASH_MAX_PENDING: int = 32  # running + waiting; more are refused with 503
+    EVENT_ACCESS_CACHE_SECONDS: float = 30.0  # agent-owns-event checks (get_event_agent)
+    BOARD_STREAM_TICKET_SECONDS: int = 60  # lifetime of a board stream ticket (get_stream_agent_id)
+
+    # Phone numbers without a country code are read as this region (app/phones.py)
+    PHONE_DEFAULT_REGION: str = "GR"
+
+    # SMS outbox delivery (see app/outbox.py)
+    OUTBOX_WORKER_ENABLED: bool = True
+    OUTBOX_POLL_SECONDS: float = 2.0
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 5
+
+    # Background player imports running at once, per process
+    IMPORT_JOB_WORKERS: int = 2
+    # Each process touches its queued/running jobs this often; jobs untouched for
+    # IMPORT_JOB_STALE_SECONDS lost their process and are failed at startup
+    IMPORT_JOB_HEARTBEAT_SECONDS: float = 60.0
+    IMPORT_JOB_STALE_SECONDS: float = 300.0
+
 settings = Settings()
@@ -1,20 +1,57 @@
 # backend/app/db.py
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from .config import settings
+from .dbpool import TimedAsyncQueuePool, TimedQueuePool
+
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "postgresql+psycopg://pingpong:pingpong@db:5432/pingpong",
 )
+# psycopg 3 serves both engines from the same URL; override only for another driver.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", DATABASE_URL)
+
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **POOL_OPTIONS)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
+# Optional streaming replica for read-only routes; see app/replicas.py.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL", DATABASE_REPLICA_URL)
+
+# Async routes wait on the database without holding a threadpool thread, so
+# their concurrency is bounded by this engine's pool rather than by the
+# AnyIO thread limit. Objects stay loaded after commit: lazy loads cannot
+# run outside ``AsyncSession.run_sync``, so routes refresh what they return.
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncQueuePool, **POOL_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+replica_engine = async_replica_engine = None
+ReplicaSessionLocal = AsyncReplicaSessionLocal = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_engine(DATABASE_REPLICA_URL, poolclass=TimedQueuePool, **POOL_OPTIONS)
+    ReplicaSessionLocal = sessionmaker(bind=replica_engine, autocommit=False, autoflush=False)
+    async_replica_engine = create_async_engine(ASYNC_DATABASE_REPLICA_URL, poolclass=TimedAsyncQueuePool, **POOL_OPTIONS)
+    AsyncReplicaSessionLocal = async_sessionmaker(bind=async_replica_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
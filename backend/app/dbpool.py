@@ -0,0 +1,91 @@
+# backend/app/dbpool.py
+"""Connection pools that report how they are used, for ``GET /metrics/db-pool``.
+
+SQLAlchemy's pool knows how many connections are checked out and in
+overflow, but not how long requests waited to get one. These subclasses
+time every checkout and count the ones that gave up after ``pool_timeout``.
+
+Sizing: Postgres ``max_connections`` must cover, for every uvicorn worker,
+both engines' ``pool_size + max_overflow`` plus the pubsub listener.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from . import latency
+
+# Wait percentiles are computed over this many recent checkouts.
+WAIT_SAMPLES = 1000
+
+
+class _PoolStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def record(self, started_at: float, timed_out: bool) -> None:
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms.append((time.perf_counter() - started_at) * 1000)
+
+
+class _TimedPoolMixin:
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = _PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats  # keep counting across engine.dispose()
+        return pool
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(started_at, timed_out=True)
+            raise
+        self.stats.record(started_at, timed_out=False)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool: Pool) -> Dict[str, object]:
+    result: Dict[str, object] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        result.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # Negative while the pool has not yet opened pool_size connections.
+            overflow=pool.overflow(),
+            timeout_seconds=pool.timeout(),
+        )
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, _PoolStats):
+        with stats.lock:
+            result.update(
+                checkouts=stats.checkouts,
+                timeouts=stats.timeouts,
+                wait_ms=latency.summary(stats.wait_ms),
+            )
+    return result
@@ -0,0 +1,102 @@
+# backend/app/hashing.py
+"""Password hashing off the request threadpool.
+
+bcrypt takes tens of milliseconds of CPU per call. Run in the shared AnyIO
+threadpool, a burst of logins at check-in time would occupy every thread and
+stall board polls. Hashes run instead on a small dedicated pool. Requests
+beyond ``PASSWORD_HASH_MAX_PENDING`` (running plus waiting) are refused with
+a 503 and ``Retry-After`` rather than queued without bound.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, TypeVar
+
+from fastapi import HTTPException, status
+
+from . import latency
+from .config import settings
+from .security import hash_password, verify_password
+
+T = TypeVar("T")
+
+# Latency percentiles are computed over this many recent hashes.
+LATENCY_SAMPLES = 1000
+
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+_lock = threading.Lock()
+_queued = 0
+_running = 0
+_completed = 0
+_rejected = 0
+_wait_ms: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+_run_ms: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+
+async def _submit(fn: Callable[..., T], *args) -> T:
+    global _queued, _rejected
+    if not _slots.acquire(blocking=False):
+        with _lock:
+            _rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins in progress, please retry in a moment",
+            headers={"Retry-After": "1"},
+        )
+
+    enqueued_at = time.perf_counter()
+    with _lock:
+        _queued += 1
+
+    def task() -> T:
+        global _queued, _running, _completed
+        started_at = time.perf_counter()
+        with _lock:
+            _queued -= 1
+            _running += 1
+            _wait_ms.append((started_at - enqueued_at) * 1000)
+        try:
+            return fn(*args)
+        finally:
+            with _lock:
+                _running -= 1
+                _completed += 1
+                _run_ms.append((time.perf_counter() - started_at) * 1000)
+
+    def release(future: Future) -> None:
+        global _queued
+        if future.cancelled():  # client went away before the hash started
+            with _lock:
+                _queued -= 1
+        _slots.release()
+
+    future = _executor.submit(task)
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _submit(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _submit(verify_password, password, hashed)
+
+
+def stats() -> Dict[str, object]:
+    with _lock:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+            "queue_depth": _queued,
+            "running": _running,
+            "completed": _completed,
+            "rejected": _rejected,
+            "wait_ms": latency.summary(_wait_ms),
+            "hash_ms": latency.summary(_run_ms),
+        }
@@ -0,0 +1,17 @@
+# backend/app/latency.py
+"""Percentiles of recent latency samples, as reported by the /metrics routes."""
+
+from typing import Dict, Iterable, Sequence
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of samples sorted ascending; 0.0 without samples."""
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 2)
+
+
+def summary(samples: Iterable[float]) -> Dict[str, float]:
+    """p50 / p95 / max of ``samples``, in their unit (milliseconds here)."""
+    ordered = sorted(samples)
+    return {"p50": percentile(ordered, 0.5), "p95": percentile(ordered, 0.95), "max": percentile(ordered, 1.0)}
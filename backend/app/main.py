@@ -1,10 +1,13 @@
 # backend/app/main.py
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+from . import migrations, outbox, pubsub
 from .config import settings
-from .db import Base, engine
-from .routers import assignments, auth, events, players, registrations, tables, agents
-from .twilio_status import router as twilio_router
+from .db import Base, async_engine, async_replica_engine, engine
+from .routers import assignments, auth, events, metrics, players, queue, registrations, tables, agents
+from .twilio_status import router as twilio_router, status_writer
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -16,8 +19,56 @@ API_PREFIX = "/api"
 
 @app.on_event("startup")
 def on_startup():
-    # Dev-only convenience: create tables if not exist.
-    Base.metadata.create_all(bind=engine)
+    if settings.DB_STARTUP_SCHEMA == "migrate":
+        migrations.upgrade(engine)
+    elif settings.DB_STARTUP_SCHEMA == "create_all":
+        # Dev-only convenience: create tables if not exist.
+        Base.metadata.create_all(bind=engine)
+    players.fail_stale_import_jobs()
+
+@app.on_event("startup")
+async def start_background_workers():
+    await pubsub.start()
+    outbox.start()
+    status_writer.start()
+    players.start_import_heartbeat()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    players.stop_import_heartbeat()
+    status_writer.stop()
+    outbox.stop()
+    await pubsub.stop()
+    await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
+
+# Unique constraints a request can hit by racing another one past its own
+# existence check, mapped to what the operator should read.
+CONFLICT_DETAILS = {
+    "uq_assignment_active_table": "Table is not free",
+    "uq_assignment_active_player1": "One of the players is already assigned to another table",
+    "uq_assignment_active_player2": "One of the players is already assigned to another table",
+    "un_event_player": "Player already registered for this event",
+    "uq_table_event_position": "Table with this position already exists",
+    "un_agent_phone_number": "This phone number already exists in the Player database",
+    "un_agent_phone_e164": "This phone number already exists in the Player database",
+    "agent_email_key": "Email already registered",
+}
+
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    # Lost a race against another request; the session is rolled back by get_db.
+    # Any other violation (NOT NULL, foreign keys) is a bug and stays a 500.
+    constraint = getattr(getattr(exc.orig, "diag", None), "constraint_name", None)
+    if constraint not in CONFLICT_DETAILS:
+        raise exc
+    return JSONResponse(status_code=409, content={"detail": CONFLICT_DETAILS[constraint]})
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # No connection came free within DB_POOL_TIMEOUT; ask the client to back off.
+    return JSONResponse(status_code=503, content={"detail": "Server busy, please retry"}, headers={"Retry-After": "1"})
 
 @app.get("/healthz", tags=["meta"])
 def healthz():
@@ -34,9 +85,12 @@ def root():
 # Routers
 app.include_router(events.router, prefix=API_PREFIX)
 app.include_router(players.router, prefix=API_PREFIX)
+app.include_router(players.event_router, prefix=API_PREFIX)
 app.include_router(registrations.router, prefix=API_PREFIX)
 app.include_router(tables.router, prefix=API_PREFIX)
 app.include_router(assignments.router, prefix=API_PREFIX)
+app.include_router(queue.router, prefix=API_PREFIX)
 app.include_router(agents.router, prefix=API_PREFIX)
 app.include_router(auth.router, prefix=API_PREFIX)
 app.include_router(twilio_router)
+app.include_router(metrics.router)
@@ -0,0 +1,113 @@
+# backend/app/migrations/__init__.py
+"""Versioned schema migrations.
+
+Each ``mNNNN_<name>.py`` module here exposes ``upgrade(conn)`` and is safe
+to run more than once. :func:`upgrade` applies, in order, the ones not yet
+recorded in the ``schema_migration`` table, each in its own transaction:
+
+    python -m app.migrations
+
+That, or startup with ``DB_STARTUP_SCHEMA=migrate``, is the only entry
+point. The modules have no runner of their own: calling one directly
+would skip the bookkeeping and the lock, and the runner would apply it
+again later.
+
+A database without the app's tables is created from the models, which
+already carry every migration's changes, and all migrations are recorded as
+applied. A database created by ``create_all`` before ``schema_migration``
+existed gets every migration once, which the modules tolerate. Nothing
+else touches an existing database, so every table, column and index added
+to the models needs a module here; ``tests/test_migrations.py`` upgrades
+the pre-migration schema (``tests/baseline_schema.sql``) and compares the
+result with the models.
+
+Modules run on Postgres and on SQLite (local experiments, tests). Checks
+for existing columns and indexes go through :func:`has_column` and
+:func:`has_index` rather than ``IF NOT EXISTS`` forms SQLite lacks.
+
+On Postgres, concurrent runs (several workers booting with
+``DB_STARTUP_SCHEMA=migrate``) take turns on an advisory lock; the later
+ones find nothing pending.
+"""
+
+import importlib
+import logging
+import pkgutil
+import re
+from typing import List
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+_MODULE_NAME = re.compile(r"^m\d{4}_\w+$")
+_ADVISORY_LOCK_ID = 4_917_203  # any constant unique to this app
+
+_metadata = MetaData()
+schema_migration = Table(
+    "schema_migration",
+    _metadata,
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn: Connection, table: str, name: str) -> bool:
+    """Whether ``table`` has an index or unique constraint called ``name``."""
+    inspector = inspect(conn)
+    names = {ix["name"] for ix in inspector.get_indexes(table)}
+    names.update(uc["name"] for uc in inspector.get_unique_constraints(table))
+    return name in names
+
+
+def available() -> List[str]:
+    """Migration module names, oldest first."""
+    return sorted(name for _, name, _ in pkgutil.iter_modules(__path__) if _MODULE_NAME.match(name))
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """Bring the schema up to date; return the migrations recorded by this run."""
+    with engine.connect() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            conn.commit()
+        try:
+            return _upgrade(conn)
+        finally:
+            conn.rollback()  # a failed migration leaves its transaction aborted
+            if postgres:
+                # Session-level lock: it would outlive the checkout in the pool.
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+                conn.commit()
+
+
+def _upgrade(conn: Connection) -> List[str]:
+    from .. import models
+    from ..db import Base
+
+    fresh = not inspect(conn).has_table(models.Agent.__tablename__)
+    _metadata.create_all(conn)
+    applied = set(conn.execute(select(schema_migration.c.version)).scalars())
+    conn.commit()
+    pending = [name for name in available() if name not in applied]
+
+    if fresh:
+        Base.metadata.create_all(conn)
+        if pending:
+            conn.execute(schema_migration.insert(), [{"version": name} for name in pending])
+        conn.commit()
+        logger.info("created the schema; recorded %d migrations as applied", len(pending))
+        return pending
+
+    for name in pending:
+        logger.info("applying migration %s", name)
+        importlib.import_module(f"{__name__}.{name}").upgrade(conn)
+        conn.execute(schema_migration.insert().values(version=name))
+        conn.commit()
+    return pending
@@ -0,0 +1,11 @@
+# backend/app/migrations/__main__.py
+"""``python -m app.migrations``: apply pending migrations, e.g. once per deploy."""
+
+import logging
+
+from ..db import engine
+from . import upgrade
+
+logging.basicConfig(level=logging.INFO)
+applied = upgrade(engine)
+logging.getLogger(__name__).info("%d migrations applied", len(applied))
@@ -0,0 +1,50 @@
+# backend/app/migrations/m0001_player_phone_e164.py
+"""Add player.phone_e164, backfill it from phone_number, and make it unique per agent.
+
+Numbers that cannot be parsed, and numbers that normalise to one another
+within an agent ("69..." next to "+3069..."), are left NULL and logged, so
+the unique constraint can be added; fix those players by hand.
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..phones import to_e164
+from . import has_column, has_index
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade(conn: Connection) -> None:
+    if not has_column(conn, "player", "phone_e164"):
+        conn.execute(text("ALTER TABLE player ADD COLUMN phone_e164 VARCHAR"))
+
+    rows = conn.execute(text("SELECT id, agent_id, phone_number, phone_e164 FROM player ORDER BY id")).all()
+    taken = {(agent_id, e164) for _, agent_id, _, e164 in rows if e164}
+    updates = []
+    for player_id, agent_id, raw, e164 in rows:
+        if e164 is not None or not raw:
+            continue
+        e164 = to_e164(raw)
+        if e164 is None:
+            logger.warning("player %s: '%s' is not a valid phone number, left unset", player_id, raw)
+            continue
+        if (agent_id, e164) in taken:
+            logger.warning("player %s: '%s' duplicates another player's number, left unset", player_id, raw)
+            continue
+        taken.add((agent_id, e164))
+        updates.append({"id": player_id, "phone_e164": e164})
+    if updates:
+        conn.execute(text("UPDATE player SET phone_e164 = :phone_e164 WHERE id = :id"), updates)
+
+    if not has_index(conn, "player", "un_agent_phone_e164"):
+        if conn.dialect.name == "postgresql":
+            conn.execute(
+                text("ALTER TABLE player ADD CONSTRAINT un_agent_phone_e164 UNIQUE (agent_id, phone_e164)")
+            )
+        else:
+            # SQLite cannot add a constraint to an existing table; a unique index enforces the same.
+            conn.execute(text("CREATE UNIQUE INDEX un_agent_phone_e164 ON player (agent_id, phone_e164)"))
+    logger.info("phone_e164 backfilled for %d players", len(updates))
@@ -0,0 +1,17 @@
+# backend/app/migrations/m0002_list_pagination_indexes.py
+"""Composite indexes behind keyset pagination of the players and registrations lists."""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_player_agent_created ON player (agent_id, created_at, id)")
+    )
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_registration_event_created "
+            "ON registration (event_id, created_at, id)"
+        )
+    )
@@ -0,0 +1,18 @@
+# backend/app/migrations/m0003_state_versions.py
+"""Add event.state_version and agent.players_version, the counters behind the poll ETags."""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from . import has_column
+
+COLUMNS = (
+    ("event", "state_version"),
+    ("agent", "players_version"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for table, column in COLUMNS:
+        if not has_column(conn, table, column):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
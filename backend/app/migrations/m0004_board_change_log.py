@@ -0,0 +1,26 @@
+# backend/app/migrations/m0004_board_change_log.py
+"""Add the board_change log and event.changes_floor behind ``GET .../tables/changes``."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, Table, func, text
+from sqlalchemy.engine import Connection
+
+from . import has_column
+
+metadata = MetaData()
+Table("event", metadata, Column("id", Integer, primary_key=True))  # referenced only
+board_change = Table(
+    "board_change",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("event_id", Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("table_id", Integer, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Index("ix_board_change_event_version", "event_id", "version"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if not has_column(conn, "event", "changes_floor"):
+        conn.execute(text("ALTER TABLE event ADD COLUMN changes_floor INTEGER NOT NULL DEFAULT 0"))
+    board_change.create(conn, checkfirst=True)
@@ -0,0 +1,58 @@
+# backend/app/migrations/m0005_active_assignment_indexes.py
+"""Add the partial unique indexes allowing one active assignment per table and player slot.
+
+Existing duplicates (two active matches on one table, or one player active
+twice in an event) would make the index build fail half way. They are
+looked for first; if any exist, each group is logged and nothing is
+created. Finish all but one assignment of each group, then run
+``python -m app.migrations`` again.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from . import has_index
+
+logger = logging.getLogger(__name__)
+
+INDEXES = (
+    ("uq_assignment_active_table", ("table_id",)),
+    ("uq_assignment_active_player1", ("event_id", "player1_id")),
+    ("uq_assignment_active_player2", ("event_id", "player2_id")),
+)
+
+
+def _duplicates(conn: Connection, columns: Tuple[str, ...]) -> Dict[tuple, List[int]]:
+    groups: Dict[tuple, List[int]] = defaultdict(list)
+    rows = conn.execute(
+        text(f"SELECT id, {', '.join(columns)} FROM assignment WHERE status = 'active' ORDER BY id")
+    )
+    for assignment_id, *key in rows:
+        if None not in key:  # NULLs never collide in a unique index
+            groups[tuple(key)].append(assignment_id)
+    return {key: ids for key, ids in groups.items() if len(ids) > 1}
+
+
+def upgrade(conn: Connection) -> None:
+    missing = [(name, columns) for name, columns in INDEXES if not has_index(conn, "assignment", name)]
+
+    conflicts = 0
+    for name, columns in missing:
+        for key, ids in _duplicates(conn, columns).items():
+            conflicts += 1
+            where = ", ".join(f"{column}={value}" for column, value in zip(columns, key))
+            logger.error("%s: assignments %s are all active for %s", name, ", ".join(map(str, ids)), where)
+    if conflicts:
+        raise RuntimeError(
+            f"{conflicts} groups of duplicate active assignments (logged above); "
+            "finish all but one assignment of each and rerun"
+        )
+
+    for name, columns in missing:
+        conn.execute(
+            text(f"CREATE UNIQUE INDEX {name} ON assignment ({', '.join(columns)}) WHERE status = 'active'")
+        )
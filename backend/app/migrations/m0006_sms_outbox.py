@@ -0,0 +1,29 @@
+# backend/app/migrations/m0006_sms_outbox.py
+"""Add the sms_outbox table the assignment SMS are queued in (app.outbox)."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, func
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+Table("assignment", metadata, Column("id", Integer, primary_key=True))  # referenced only
+Table("player", metadata, Column("id", Integer, primary_key=True))  # referenced only
+sms_outbox = Table(
+    "sms_outbox",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("assignment_id", Integer, ForeignKey("assignment.id", ondelete="CASCADE"), nullable=False),
+    Column("player_id", Integer, ForeignKey("player.id", ondelete="CASCADE"), nullable=False),
+    Column("to_number", String, nullable=False),
+    Column("body", String, nullable=False),
+    Column("status", String, nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("last_error", String, nullable=True),
+    Column("available_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("sent_at", DateTime(timezone=True), nullable=True),
+    Index("ix_sms_outbox_status_available", "status", "available_at"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    sms_outbox.create(conn, checkfirst=True)
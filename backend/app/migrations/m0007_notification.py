@@ -0,0 +1,27 @@
+# backend/app/migrations/m0007_notification.py
+"""Add the notification table Twilio status callbacks are written to (app.twilio_status)."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, func
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+Table("assignment", metadata, Column("id", Integer, primary_key=True))  # referenced only
+Table("player", metadata, Column("id", Integer, primary_key=True))  # referenced only
+notification = Table(
+    "notification",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("message_sid", String, nullable=False, unique=True),
+    Column("assignment_id", Integer, ForeignKey("assignment.id", ondelete="SET NULL"), nullable=True),
+    Column("player_id", Integer, ForeignKey("player.id", ondelete="SET NULL"), nullable=True),
+    Column("to_number", String, nullable=True),
+    Column("status", String, nullable=False),
+    Column("error_code", String, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Index("ix_notification_assignment_id", "assignment_id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    notification.create(conn, checkfirst=True)
@@ -0,0 +1,28 @@
+# backend/app/migrations/m0008_match_queue.py
+"""Add the match_queue table pairings wait in for a free table (app.scheduler)."""
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, func
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+Table("event", metadata, Column("id", Integer, primary_key=True))  # referenced only
+Table("player", metadata, Column("id", Integer, primary_key=True))  # referenced only
+Table("assignment", metadata, Column("id", Integer, primary_key=True))  # referenced only
+match_queue = Table(
+    "match_queue",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("event_id", Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False),
+    Column("player1_id", Integer, ForeignKey("player.id", ondelete="CASCADE"), nullable=False),
+    Column("player2_id", Integer, ForeignKey("player.id", ondelete="CASCADE"), nullable=False),
+    Column("notify", Boolean, nullable=False),
+    Column("status", String, nullable=False),
+    Column("assignment_id", Integer, ForeignKey("assignment.id", ondelete="SET NULL"), nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("assigned_at", DateTime(timezone=True), nullable=True),
+    Index("ix_match_queue_event_status", "event_id", "status", "id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    match_queue.create(conn, checkfirst=True)
@@ -0,0 +1,52 @@
+# backend/app/migrations/m0009_player_import_job.py
+"""Add the player_import_job table behind background imports (POST /players/import?background=true).
+
+A table created by ``create_all`` before jobs kept an error count and a
+heartbeat gets the error_count and updated_at columns.
+"""
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+
+from . import has_column
+
+metadata = MetaData()
+Table("agent", metadata, Column("id", Integer, primary_key=True))  # referenced only
+player_import_job = Table(
+    "player_import_job",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("agent_id", Integer, ForeignKey("agent.id", ondelete="CASCADE"), nullable=False),
+    Column("filename", String, nullable=True),
+    Column("status", String, nullable=False),
+    Column("total_rows", Integer, nullable=False),
+    Column("created", Integer, nullable=False),
+    Column("skipped", Integer, nullable=False),
+    Column("errors", JSON, nullable=False),
+    Column("error_count", Integer, nullable=False, server_default="0"),
+    Column("detail", String, nullable=True),
+    Column("cancel_requested", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Index("ix_player_import_job_agent_id", "agent_id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    player_import_job.create(conn, checkfirst=True)
+    if not has_column(conn, "player_import_job", "error_count"):
+        conn.execute(text("ALTER TABLE player_import_job ADD COLUMN error_count INTEGER NOT NULL DEFAULT 0"))
+    if not has_column(conn, "player_import_job", "updated_at"):
+        if conn.dialect.name == "postgresql":
+            conn.execute(
+                text("ALTER TABLE player_import_job ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now()")
+            )
+        else:
+            # SQLite only adds columns with a constant default; stamp existing rows after.
+            conn.execute(
+                text("ALTER TABLE player_import_job ADD COLUMN updated_at DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'")
+            )
+            conn.execute(text("UPDATE player_import_job SET updated_at = CURRENT_TIMESTAMP"))
@@ -0,0 +1,22 @@
+# backend/app/migrations/m0010_hot_query_indexes.py
+"""Indexes behind the desk, scheduler and player-state queries.
+
+``agent.api_token`` needs none: its unique constraint is already a btree
+index, which the token lookup uses.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS ix_assignment_event_status ON assignment (event_id, status)',
+    'CREATE INDEX IF NOT EXISTS ix_assignment_player1 ON assignment (player1_id)',
+    'CREATE INDEX IF NOT EXISTS ix_assignment_player2 ON assignment (player2_id)',
+    'CREATE INDEX IF NOT EXISTS ix_registration_player ON registration (player_id)',
+    'CREATE INDEX IF NOT EXISTS ix_table_event_status ON "table" (event_id, status)',
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for statement in INDEXES:
+        conn.execute(text(statement))
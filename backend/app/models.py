@@ -1,9 +1,9 @@
 # backend/app/models.py
 import uuid
-from sqlalchemy import Column, String, Integer, DateTime, UniqueConstraint, ForeignKey
+from sqlalchemy import JSON, Boolean, Column, String, Integer, DateTime, UniqueConstraint, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from .db import Base
 
 class Event(Base):
@@ -16,6 +16,8 @@ class Event(Base):
     starts_at = Column(DateTime(timezone=True), nullable=True)
     location = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    state_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped on every board/registration change
+    changes_floor = Column(Integer, nullable=False, default=0, server_default="0")  # board_change rows up to this version were compacted
 
     agent = relationship("Agent", back_populates="events")
 
@@ -28,12 +30,17 @@ class Event(Base):
 
 class Player(Base):
     __tablename__ = "player"
-    __table_args__ = (UniqueConstraint("agent_id", "phone_number", name="un_agent_phone_number"),)
+    __table_args__ = (
+        UniqueConstraint("agent_id", "phone_number", name="un_agent_phone_number"),
+        UniqueConstraint("agent_id", "phone_e164", name="un_agent_phone_e164"),
+        Index("ix_player_agent_created", "agent_id", "created_at", "id"),  # keyset pages, newest first
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     agent_id = Column(Integer, ForeignKey("agent.id", ondelete="CASCADE"), nullable=False)
     full_name = Column(String, nullable=False)
-    phone_number = Column(String, nullable=True)
+    phone_number = Column(String, nullable=True)  # as entered, for display
+    phone_e164 = Column(String, nullable=True)  # canonical form (app/phones.py); used for lookups and SMS
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     agent = relationship("Agent", back_populates="players")
@@ -47,7 +54,11 @@ class Player(Base):
 
 class Registration(Base):
     __tablename__ = "registration"
-    __table_args__ = (UniqueConstraint("event_id", "player_id", name="un_event_player"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "player_id", name="un_event_player"),
+        Index("ix_registration_event_created", "event_id", "created_at", "id"),  # keyset pages, newest first
+        Index("ix_registration_player", "player_id"),  # player state, player deletes
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     event_id = Column(Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
@@ -62,6 +73,7 @@ class Table(Base):
     __tablename__ = "table"
     __table_args__ = (
         UniqueConstraint("event_id", "position", name="uq_table_event_position"),  # optional but useful
+        Index("ix_table_event_status", "event_id", "status"),  # free tables for the scheduler
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -73,8 +85,23 @@ class Table(Base):
     event = relationship("Event")
 
 
+_ACTIVE = text("status = 'active'")
+
+
 class Assignment(Base):
     __tablename__ = "assignment"
+    __table_args__ = (
+        # At most one active match per table and per player slot; a player in
+        # player1 of one match and player2 of another is prevented by the
+        # player row locks taken in app.scheduler.lock_players.
+        Index("uq_assignment_active_table", "table_id", unique=True, postgresql_where=_ACTIVE, sqlite_where=_ACTIVE),
+        Index("uq_assignment_active_player1", "event_id", "player1_id", unique=True, postgresql_where=_ACTIVE, sqlite_where=_ACTIVE),
+        Index("uq_assignment_active_player2", "event_id", "player2_id", unique=True, postgresql_where=_ACTIVE, sqlite_where=_ACTIVE),
+        Index("ix_assignment_event_status", "event_id", "status"),
+        # Whole-history lookups by player, including the RESTRICT check when a player is deleted.
+        Index("ix_assignment_player1", "player1_id"),
+        Index("ix_assignment_player2", "player2_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     event_id = Column(Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
@@ -95,6 +122,98 @@ class Assignment(Base):
     player2 = relationship("Player", foreign_keys=[player2_id])
 
 
+class QueuedMatch(Base):
+    """A pairing waiting for the next free table (see app.scheduler)."""
+
+    __tablename__ = "match_queue"
+    __table_args__ = (Index("ix_match_queue_event_status", "event_id", "status", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
+    player1_id = Column(Integer, ForeignKey("player.id", ondelete="CASCADE"), nullable=False)
+    player2_id = Column(Integer, ForeignKey("player.id", ondelete="CASCADE"), nullable=False)
+    notify = Column(Boolean, nullable=False, default=True)
+    status = Column(String, nullable=False, default="waiting")  # waiting|assigned|cancelled
+    assignment_id = Column(Integer, ForeignKey("assignment.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    assigned_at = Column(DateTime(timezone=True), nullable=True)
+
+    player1 = relationship("Player", foreign_keys=[player1_id])
+    player2 = relationship("Player", foreign_keys=[player2_id])
+
+
+class OutboxMessage(Base):
+    """SMS queued in the same transaction as the assignment, sent by app.outbox."""
+
+    __tablename__ = "sms_outbox"
+    __table_args__ = (Index("ix_sms_outbox_status_available", "status", "available_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    assignment_id = Column(Integer, ForeignKey("assignment.id", ondelete="CASCADE"), nullable=False)
+    player_id = Column(Integer, ForeignKey("player.id", ondelete="CASCADE"), nullable=False)
+    to_number = Column(String, nullable=False)
+    body = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending|sent|failed|cancelled
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    assignment = relationship("Assignment")
+
+
+class Notification(Base):
+    """One SMS handed to Twilio, kept up to date by its status callbacks."""
+
+    __tablename__ = "notification"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    message_sid = Column(String, nullable=False, unique=True)
+    assignment_id = Column(Integer, ForeignKey("assignment.id", ondelete="SET NULL"), nullable=True, index=True)
+    player_id = Column(Integer, ForeignKey("player.id", ondelete="SET NULL"), nullable=True)
+    to_number = Column(String, nullable=True)
+    status = Column(String, nullable=False)  # queued|sending|sent|delivered|undelivered|failed
+    error_code = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class BoardChange(Base):
+    """Append-only log of which tables changed at which event version."""
+
+    __tablename__ = "board_change"
+    __table_args__ = (Index("ix_board_change_event_version", "event_id", "version"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    table_id = Column(Integer, nullable=True)  # no FK: deletions must stay in the log; NULL = structural change
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ImportJob(Base):
+    """A player import running in the background (POST /players/import?background=true)."""
+
+    __tablename__ = "player_import_job"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    agent_id = Column(Integer, ForeignKey("agent.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="queued")  # queued|running|completed|failed|cancelled
+    total_rows = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # the first MAX_JOB_ERRORS messages
+    error_count = Column(Integer, nullable=False, default=0, server_default="0")  # all of them
+    detail = Column(String, nullable=True)  # why a failed job failed
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 class Agent(Base):
     __tablename__ = "agent"
 
@@ -104,6 +223,7 @@ class Agent(Base):
     password_hash = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     api_token = Column(String, nullable=True, unique=True)
+    players_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped on every player change
 
     events = relationship("Event", back_populates="agent", cascade="all, delete-orphan")
     players = relationship("Player", back_populates="agent", cascade="all, delete-orphan")
@@ -2,15 +2,26 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, List, Optional
 from zoneinfo import ZoneInfo
 
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from twilio.base.exceptions import TwilioException
 from twilio.rest import Client
 
+from . import pubsub
 from .config import settings
-from .models import Assignment, Player, Table
-from .twilio_conf import TwilioSettings, get_twilio_settings
+from .models import Assignment, Notification, OutboxMessage, Player, Table
+from .twilio_conf import TwilioSettings, get_twilio_settings, status_callback_url
+
+# pg_notify channel that wakes the outbox workers (app/outbox.py).
+OUTBOX_CHANNEL = "sms_outbox"
+
+
+# Twilio statuses that are never followed by another callback.
+FINAL_STATUSES = ("delivered", "undelivered", "failed", "read")
 
 
 class NotificationError(RuntimeError):
@@ -18,9 +29,9 @@ class NotificationError(RuntimeError):
 
 
 @dataclass
-class NotificationResult:
-    success: bool
-    timestamp: datetime
+class SentMessage:
+    sid: str
+    status: Optional[str]
 
 
 _client: Client | None = None
@@ -71,40 +82,129 @@ def _message_body(player: Player, opponent: Player, table: Table, match_time: da
     )
 
 
-def _send_sms(to: str, body: str, cfg: TwilioSettings) -> None:
+def _send_sms(to: str, body: str, cfg: TwilioSettings) -> SentMessage:
     client = _get_client()
-    params: dict[str, str] = {"to": _e164_gr(to), "body": body}
+    params: dict[str, str] = {"to": to, "body": body}
     if cfg.TWILIO_MESSAGING_SERVICE_SID:
         params["messaging_service_sid"] = cfg.TWILIO_MESSAGING_SERVICE_SID
     else:
         params["from_"] = cfg.TWILIO_FROM_NUMBER  # type: ignore[assignment]
-    params["status_callback"] = f"{cfg.BASE_URL.rstrip('/')}/twilio/status"
-    params.pop("status_callback", None)  # FEEDBACK WE NEED TO PUBLISH URL TO INORDER TO RECEIVE STATUS UPDATES
+    params["status_callback"] = status_callback_url(cfg)
+    if not cfg.TWILIO_STATUS_CALLBACK_ENABLED:
+        params.pop("status_callback", None)  # FEEDBACK WE NEED TO PUBLISH URL TO INORDER TO RECEIVE STATUS UPDATES
     try:
-        client.messages.create(**params)
+        message = client.messages.create(**params)
     except TwilioException as exc:  # pragma: no cover - network
         raise NotificationError(f"Failed to send SMS via Twilio: {exc}") from exc
-
-
-def notify_players(table: Table, assignment: Assignment, players: Iterable[Player], opponents: Iterable[Player], event_name: str | None) -> NotificationResult:
-    cfg = _get_settings()
+    return SentMessage(sid=message.sid, status=message.status)
+
+
+def enqueue_notifications(
+    db: Session,
+    table: Table,
+    assignment: Assignment,
+    players: Iterable[Player],
+    opponents: Iterable[Player],
+    event_name: str | None,
+) -> List[OutboxMessage]:
+    """Queue one SMS per player in the caller's transaction.
+
+    Nothing is sent here; the outbox worker delivers the messages after
+    commit and fills in ``assignment.notified_at``. Configuration and
+    missing phone numbers are still reported immediately.
+    """
+    check_configured()
+    messages = outbox_messages(table, assignment, players, opponents, event_name)
+    enqueue_messages(db, messages)
+    return messages
+
+
+def outbox_messages(
+    table: Table,
+    assignment: Assignment,
+    players: Iterable[Player],
+    opponents: Iterable[Player],
+    event_name: str | None,
+) -> List[OutboxMessage]:
+    """Render the outbox rows for one assignment without touching the session."""
     timestamp = datetime.now(timezone.utc)
-
+    messages: List[OutboxMessage] = []
     for player, opponent in zip(players, opponents):
-        if not player.phone_number:
+        if not player.phone_e164:
             raise NotificationError(f"Player {player.full_name} does not have a phone number configured")
-        body = _message_body(player, opponent, table, assignment.created_at or timestamp, event_name)
-        _send_sms(player.phone_number, body, cfg)
-
-    return NotificationResult(success=True, timestamp=timestamp)
-
-def _e164_gr(n: str) -> str:
-    digits = "".join(ch for ch in n if ch.isdigit() or ch == "+")
-    if digits.startswith("0030"):
-        digits = "+" + digits[2:]
-    if digits.startswith("30"):
-        digits = "+" + digits
-    if not digits.startswith("+"):
-        digits = "+30" + digits
-    return digits
+        messages.append(
+            OutboxMessage(
+                assignment_id=assignment.id,
+                player_id=player.id,
+                to_number=player.phone_e164,
+                body=_message_body(player, opponent, table, assignment.created_at or timestamp, event_name),
+                status="pending",
+                attempts=0,
+                available_at=timestamp,
+            )
+        )
+    return messages
+
+
+def enqueue_messages(db: Session, messages: List[OutboxMessage]) -> None:
+    """Add rendered outbox rows and wake the workers once on commit."""
+    if not messages:
+        return
+    db.add_all(messages)
+    pubsub.notify(db, OUTBOX_CHANNEL, "")
+
+
+def check_configured() -> None:
+    """Raise :class:`NotificationError` if Twilio is not configured."""
+    _get_settings()
+
+
+def send_outbox_message(db: Session, message: OutboxMessage) -> None:
+    """Deliver one queued message and record it in ``notification``.
+
+    Raises :class:`NotificationError` when Twilio rejects the message.
+    """
+    sent = _send_sms(message.to_number, message.body, _get_settings())
+    # A status callback may already have created the row; only fill in who it was for.
+    stmt = insert(Notification).values(
+        message_sid=sent.sid,
+        assignment_id=message.assignment_id,
+        player_id=message.player_id,
+        to_number=message.to_number,
+        status=sent.status or "queued",
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Notification.message_sid],
+            set_={
+                "assignment_id": stmt.excluded.assignment_id,
+                "player_id": stmt.excluded.player_id,
+                "to_number": stmt.excluded.to_number,
+            },
+        )
+    )
+
+
+def apply_status_updates(db: Session, updates: List[dict]) -> None:
+    """Upsert a batch of status callbacks in one statement.
+
+    Each dict carries ``message_sid``, ``status``, ``error_code`` and
+    ``to_number``; sids must be unique within the batch. Rows that already
+    reached a final status are left alone, so late "sent" callbacks cannot
+    overwrite "delivered".
+    """
+    if not updates:
+        return
+    stmt = insert(Notification).values(updates)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Notification.message_sid],
+            set_={
+                "status": stmt.excluded.status,
+                "error_code": func.coalesce(stmt.excluded.error_code, Notification.error_code),
+                "updated_at": func.now(),
+            },
+            where=Notification.status.notin_(FINAL_STATUSES),
+        )
+    )
 
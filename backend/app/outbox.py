@@ -0,0 +1,134 @@
+# backend/app/outbox.py
+"""Background delivery of queued SMS (the ``sms_outbox`` table).
+
+Requests only insert outbox rows, so their latency no longer depends on
+Twilio. One worker thread per process claims due rows with
+``FOR UPDATE SKIP LOCKED`` (several uvicorn workers never send the same
+message twice), sends them, and stamps ``assignment.notified_at`` once
+every message of an assignment went out. A ``pg_notify`` on commit wakes
+the workers immediately; polling is only the fallback.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+
+from sqlalchemy.orm import joinedload
+
+from . import models, pubsub
+from .board import record_board_change
+from .config import settings
+from .db import SessionLocal
+from .notifications import OUTBOX_CHANNEL, NotificationError, send_outbox_message
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 5
+
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def wake() -> None:
+    _wake.set()
+
+
+pubsub.subscribe(OUTBOX_CHANNEL, lambda _payload: wake())
+
+
+def deliver_due(limit: Optional[int] = None) -> int:
+    """Send up to ``limit`` due messages; return how many were claimed."""
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        messages = (
+            db.query(models.OutboxMessage)
+            .filter(
+                models.OutboxMessage.status == "pending",
+                models.OutboxMessage.available_at <= now,
+            )
+            .options(joinedload(models.OutboxMessage.assignment, innerjoin=True))
+            .order_by(models.OutboxMessage.id)
+            .limit(limit or settings.OUTBOX_BATCH_SIZE)
+            .with_for_update(of=models.OutboxMessage, skip_locked=True)
+            .all()
+        )
+        if not messages:
+            return 0
+
+        touched: Set[int] = set()
+        for message in messages:
+            if message.assignment.status != "active":
+                # The match ended (or was undone) before we got to it.
+                message.status = "cancelled"
+                continue
+            try:
+                send_outbox_message(db, message)
+            except NotificationError as exc:
+                message.attempts += 1
+                message.last_error = str(exc)
+                if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    message.status = "failed"
+                    logger.warning("SMS %s to %s failed permanently: %s", message.id, message.to_number, exc)
+                else:
+                    delay = RETRY_BASE_SECONDS * 2 ** (message.attempts - 1)
+                    message.available_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                continue
+            message.status = "sent"
+            message.attempts += 1
+            message.sent_at = datetime.now(timezone.utc)
+            touched.add(message.assignment_id)
+
+        db.flush()
+        for assignment_id in touched:
+            outstanding = (
+                db.query(models.OutboxMessage.id)
+                .filter(
+                    models.OutboxMessage.assignment_id == assignment_id,
+                    models.OutboxMessage.status.in_(("pending", "failed")),
+                )
+                .first()
+            )
+            if outstanding:
+                continue
+            assignment = db.get(models.Assignment, assignment_id)
+            assignment.notified_at = datetime.now(timezone.utc)
+            if assignment.table_id:
+                record_board_change(db, assignment.event_id, [assignment.table_id])
+
+        db.commit()
+        return len(messages)
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        _wake.clear()
+        try:
+            claimed = deliver_due()
+        except Exception:
+            logger.exception("outbox delivery failed")
+            claimed = 0
+        if not claimed:
+            _wake.wait(settings.OUTBOX_POLL_SECONDS)
+
+
+def start() -> None:
+    global _thread
+    if not settings.OUTBOX_WORKER_ENABLED or _thread is not None:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="sms-outbox", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    _wake.set()
+    _thread.join(timeout=10)
+    _thread = None
@@ -0,0 +1,59 @@
+# backend/app/pagination.py
+"""Keyset pagination for newest-first lists ordered by ``(created_at, id)``.
+
+A page is fetched with ``WHERE (created_at, id) < (:cursor_at, :cursor_id)``
+against a composite index ending in ``(created_at, id)``, so page N costs the
+same as page 1. The cursor for the next page is returned in the
+``X-Next-Cursor`` response header; its absence means the last page.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def contains_pattern(value: str) -> str:
+    """LIKE pattern matching ``value`` anywhere; use with ``escape="\\\\"``."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def paginate(query: Query, model, response: Response, limit: Optional[int], cursor: Optional[str]) -> list:
+    """Order ``query`` newest first and return one page of it.
+
+    Without ``limit`` the whole (filtered) list is returned, as before.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (created_at, row_id))
+    if limit is None:
+        return query.all()
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
@@ -0,0 +1,23 @@
+# backend/app/phones.py
+from typing import Optional
+
+import phonenumbers
+
+from .config import settings
+
+
+def to_e164(raw: Optional[str]) -> Optional[str]:
+    """Canonical E.164 form of ``raw`` ("+3069..."), or None if it is not a phone number.
+
+    Numbers without a country code are read as ``settings.PHONE_DEFAULT_REGION``.
+    Computed once when a player is written; lookups and SMS use the stored value.
+    """
+    if not raw or not raw.strip():
+        return None
+    try:
+        number = phonenumbers.parse(raw, settings.PHONE_DEFAULT_REGION)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
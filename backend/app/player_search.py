@@ -0,0 +1,141 @@
+# backend/app/player_search.py
+"""In-memory autocomplete over an agent's players for ``GET /players/search``.
+
+Each worker keeps one index per agent, tagged with the agent's
+``players_version``. Every player write bumps that version, so the next
+search after a write (on any worker) sees a stale tag and rebuilds; no
+explicit invalidation is needed. Searches arriving during a rebuild wait
+for it and share the result rather than each loading the players.
+
+Names are folded (NFD, combining marks dropped, casefolded) so "Γιώργος",
+"γιωργος" and "ΓΙΩΡΓΟΣ" match each other. Word prefixes are answered by
+bisecting a sorted word list; substrings by ``str.find`` over one joined
+haystack, so a query never loops over players in Python.
+"""
+
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Indexes kept per worker; the least recently searched agent is dropped first.
+MAX_CACHED_AGENTS = 64
+MAX_RESULTS = 50
+
+_SEPARATOR = "\n"
+
+Hit = Tuple[int, str, Optional[str]]  # id, full_name, phone_number
+
+
+def fold(value: str) -> str:
+    """Accent- and case-insensitive form of ``value`` (tonos and dialytika dropped)."""
+    decomposed = unicodedata.normalize("NFD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _digits(value: Optional[str]) -> str:
+    return "".join(ch for ch in value if ch.isdigit()) if value else ""
+
+
+class _AgentIndex:
+    def __init__(self, version: int, players: List[Hit], phones_e164: List[Optional[str]]) -> None:
+        self.version = version
+        self.players = players
+        names = [fold(full_name) for _, full_name, _ in players]
+        self.words = sorted(
+            (word, i) for i, name in enumerate(names) for word in {name, *name.split()}
+        )
+        self.word_keys = [word for word, _ in self.words]
+        self.names, self.name_offsets = _haystack(names)
+        phones = [
+            _SEPARATOR.join(filter(None, {_digits(raw), _digits(e164)}))
+            for (_, _, raw), e164 in zip(players, phones_e164)
+        ]
+        self.phones, self.phone_offsets = _haystack(phones)
+
+    def search(self, query: str, limit: int) -> List[Hit]:
+        found: "OrderedDict[int, None]" = OrderedDict()
+        folded = fold(query).strip()
+        digits = _digits(query)
+        if folded:
+            # Word prefix matches first: "γιω" finds "Γιώργος Παπαδόπουλος".
+            lo = bisect_left(self.word_keys, folded)
+            hi = bisect_right(self.word_keys, folded + "\uffff")
+            for i in sorted({i for _, i in self.words[lo:hi]})[:limit]:
+                found.setdefault(i, None)
+            if len(found) < limit:
+                _find_all(self.names, self.name_offsets, folded, found, limit)
+        if digits and len(found) < limit:
+            _find_all(self.phones, self.phone_offsets, digits, found, limit)
+        return [self.players[i] for i in found]
+
+
+def _haystack(values: List[str]) -> Tuple[str, List[int]]:
+    offsets: List[int] = []
+    position = 0
+    for value in values:
+        offsets.append(position)
+        position += len(value) + len(_SEPARATOR)
+    return _SEPARATOR.join(values), offsets
+
+
+def _find_all(haystack: str, offsets: List[int], needle: str, found: "OrderedDict[int, None]", limit: int) -> None:
+    start = haystack.find(needle)
+    while start != -1 and len(found) < limit:
+        i = bisect_right(offsets, start) - 1
+        found.setdefault(i, None)
+        # Skip to the next player; one hit per player is enough.
+        start = haystack.find(needle, offsets[i + 1] if i + 1 < len(offsets) else len(haystack))
+
+
+_indexes: "OrderedDict[int, _AgentIndex]" = OrderedDict()
+_lock = threading.Lock()
+# One per agent ever searched on this worker; held while that agent's index is built.
+_build_locks: Dict[int, threading.Lock] = {}
+
+
+def _load(db: Session, agent: models.Agent) -> _AgentIndex:
+    rows = (
+        db.query(models.Player.id, models.Player.full_name, models.Player.phone_number, models.Player.phone_e164)
+        .filter(models.Player.agent_id == agent.id)
+        .order_by(models.Player.full_name, models.Player.id)
+        .all()
+    )
+    return _AgentIndex(
+        agent.players_version,
+        [(pid, full_name, phone) for pid, full_name, phone, _ in rows],
+        [e164 for *_, e164 in rows],
+    )
+
+
+def _cached(agent_id: int, version: int) -> Optional[_AgentIndex]:
+    """The agent's index if it is at least as new as ``version``."""
+    with _lock:
+        index = _indexes.get(agent_id)
+        if index is None or index.version < version:
+            return None
+        _indexes.move_to_end(agent_id)
+        return index
+
+
+def search_players(db: Session, agent: models.Agent, query: str, limit: int = MAX_RESULTS) -> List[Hit]:
+    version = agent.players_version
+    index = _cached(agent.id, version)
+    if index is None:
+        with _lock:
+            build_lock = _build_locks.setdefault(agent.id, threading.Lock())
+        with build_lock:
+            index = _cached(agent.id, version)  # built by another search while we waited
+            if index is None:
+                index = _load(db, agent)
+                with _lock:
+                    _indexes[agent.id] = index
+                    _indexes.move_to_end(agent.id)
+                    while len(_indexes) > MAX_CACHED_AGENTS:
+                        _indexes.popitem(last=False)
+    return index.search(query, limit)
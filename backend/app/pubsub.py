@@ -0,0 +1,123 @@
+# backend/app/pubsub.py
+"""Cross-worker fan-out over Postgres LISTEN/NOTIFY.
+
+Publishers call :func:`notify` inside their transaction; Postgres only
+delivers the message once that transaction commits. Each uvicorn worker
+keeps a single listening connection and hands payloads to the handlers
+registered with :func:`subscribe`, so idle consumers cost no queries.
+
+When the database is not Postgres (local experiments, tests) messages are
+dispatched in-process after commit instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from .db import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+
+RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+_handlers: Dict[str, List[Handler]] = {}
+_reconnect_handlers: List[Callable[[], None]] = []
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_task: Optional[asyncio.Task] = None
+
+
+def subscribe(channel: str, handler: Handler) -> None:
+    """Register ``handler`` for payloads published on ``channel``.
+
+    Handlers run on the event loop and must not block.
+    """
+    _handlers.setdefault(channel, []).append(handler)
+
+
+def on_reconnect(handler: Callable[[], None]) -> None:
+    """Register a callback for when the listener lost messages and reconnected."""
+    _reconnect_handlers.append(handler)
+
+
+def notify(db: Session, channel: str, payload: str) -> None:
+    """Publish ``payload`` on ``channel`` when ``db``'s transaction commits."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+        return
+
+    def _dispatch_after_commit(session: Session) -> None:
+        if _loop is not None and not _loop.is_closed():
+            _loop.call_soon_threadsafe(_dispatch, channel, payload)
+
+    event.listen(db, "after_commit", _dispatch_after_commit, once=True)
+
+
+def _dispatch(channel: str, payload: str) -> None:
+    for handler in _handlers.get(channel, ()):
+        try:
+            handler(payload)
+        except Exception:  # pragma: no cover - a bad handler must not kill the listener
+            logger.exception("pubsub handler for %s failed", channel)
+
+
+def _listener_conninfo() -> Optional[str]:
+    url = make_url(DATABASE_URL)
+    if url.get_backend_name() != "postgresql":
+        return None
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _listen_forever(conninfo: str) -> None:
+    delay = RECONNECT_DELAY_SECONDS
+    first = True
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                for channel in _handlers:
+                    await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                if not first:
+                    # Anything published while we were away is gone; let consumers resync.
+                    for handler in _reconnect_handlers:
+                        handler()
+                first = False
+                delay = RECONNECT_DELAY_SECONDS
+                async for message in conn.notifies():
+                    _dispatch(message.channel, message.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("pubsub listener disconnected; retrying in %.0fs", delay, exc_info=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+
+async def start() -> None:
+    global _loop, _task
+    _loop = asyncio.get_running_loop()
+    conninfo = _listener_conninfo()
+    if conninfo is None or _task is not None:
+        return
+    _task = asyncio.create_task(_listen_forever(conninfo))
+
+
+async def stop() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
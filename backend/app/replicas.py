@@ -0,0 +1,102 @@
+# backend/app/replicas.py
+"""Send read-only routes to ``DATABASE_REPLICA_URL`` when one is configured.
+
+Read routes take :func:`get_read_db` / :func:`get_async_read_db` instead of
+``get_db``. Without a replica they hand back the request's primary session,
+so nothing changes.
+
+A replica lags the primary slightly. So that the operator who just assigned
+a table does not see it still free on their next poll, a client whose
+session commits is kept on the primary for
+``REPLICA_READ_YOUR_WRITES_SECONDS``. Clients are recognised by their
+bearer token's digest, which the auth dependencies leave in
+``session.info``; the commit is announced to every worker over pubsub.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import pubsub
+from .config import settings
+from .db import AsyncReplicaSessionLocal, ReplicaSessionLocal, get_async_db, get_db, replica_engine
+from .security import SESSION_TOKEN_KEY, _token_key
+
+RECENT_WRITES_CHANNEL = "recent_writes"
+
+# Token digest -> monotonic deadline; all entries share one TTL, so oldest first.
+_recent_writers: "OrderedDict[str, float]" = OrderedDict()
+_lock = threading.Lock()
+_all_on_primary_until = 0.0
+
+
+def _remember_writer(key: str) -> None:
+    now = time.monotonic()
+    with _lock:
+        _recent_writers[key] = now + settings.REPLICA_READ_YOUR_WRITES_SECONDS
+        _recent_writers.move_to_end(key)
+        while _recent_writers and next(iter(_recent_writers.values())) < now:
+            _recent_writers.popitem(last=False)
+
+
+def _wrote_recently(key: Optional[str]) -> bool:
+    now = time.monotonic()
+    with _lock:
+        if now < _all_on_primary_until:
+            return True
+        return key is not None and _recent_writers.get(key, 0.0) > now
+
+
+def _everyone_to_primary() -> None:
+    # Writes announced while the listener was down are lost; play safe for one window.
+    global _all_on_primary_until
+    with _lock:
+        _all_on_primary_until = time.monotonic() + settings.REPLICA_READ_YOUR_WRITES_SECONDS
+
+
+def _use_replica(request: Request) -> bool:
+    if replica_engine is None:
+        return False
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    key = _token_key(token) if scheme.lower() == "bearer" and token else None
+    return not _wrote_recently(key)
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Session for a read-only route: the replica, or the request's primary session."""
+    if not _use_replica(request):
+        yield db
+        return
+    replica = ReplicaSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+async def get_async_read_db(request: Request, db: AsyncSession = Depends(get_async_db)):
+    if not _use_replica(request):
+        yield db
+        return
+    async with AsyncReplicaSessionLocal() as replica:
+        yield replica
+
+
+@event.listens_for(Session, "before_commit")
+def _announce_write(session: Session) -> None:
+    key = session.info.get(SESSION_TOKEN_KEY)
+    if key is None or replica_engine is None:
+        return
+    _remember_writer(key)  # this worker at once; the others when the commit lands
+    pubsub.notify(session, RECENT_WRITES_CHANNEL, key)
+
+
+if replica_engine is not None:
+    pubsub.subscribe(RECENT_WRITES_CHANNEL, _remember_writer)
+    pubsub.on_reconnect(_everyone_to_primary)
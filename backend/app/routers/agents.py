@@ -1,21 +1,33 @@
 """Endpoints for managing application agents."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..db import get_db
-from ..security import hash_password
+from ..hashing import hash_password_async
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
 
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(models.Agent).filter(models.Agent.email == email).first() is not None
+
+
+def _save_agent(db: Session, agent: models.Agent) -> models.Agent:
+    db.add(agent)
+    db.commit()
+    db.refresh(agent)
+    return agent
+
+
 @router.post("", response_model=schemas.AgentOut, status_code=status.HTTP_201_CREATED)
-def create_agent(payload: schemas.AgentCreate, db: Session = Depends(get_db)):
+async def create_agent(payload: schemas.AgentCreate, db: Session = Depends(get_db)):
+    # Async so the bcrypt hash waits on the hashing pool, not on a request thread.
     email = payload.email.lower()
 
-    exists = db.query(models.Agent).filter(models.Agent.email == email).first()
-    if exists:
+    if await run_in_threadpool(_email_taken, db, email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
@@ -23,10 +35,7 @@ def create_agent(payload: schemas.AgentCreate, db: Session = Depends(get_db)):
     agent = models.Agent(
         full_name=payload.full_name,
         email=email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
     )
 
-    db.add(agent)
-    db.commit()
-    db.refresh(agent)
-    return agent
+    return await run_in_threadpool(_save_agent, db, agent)
@@ -1,27 +1,28 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
 from fastapi import APIRouter, Depends, HTTPException, Path
 from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..board import record_board_change
+from ..db import get_async_db, get_db
 from .. import models, schemas
-from ..notifications import NotificationError, notify_players
-from ..security import get_current_agent
+from .. import outbox
+from ..notifications import (
+    NotificationError,
+    check_configured,
+    enqueue_messages,
+    enqueue_notifications,
+    outbox_messages,
+)
+from ..phones import to_e164
+from ..scheduler import active_player_ids, fill_table, lock_players, registered_player_ids, start_assignment
+from ..security import get_event_agent, get_event_agent_async, owned_event
 
 router = APIRouter(prefix="/events/{event_id}", tags=["assignments"])
 
-def _get_event(db: Session, event_id: int, agent_id: int) -> models.Event:
-    ev = (
-        db.query(models.Event)
-        .filter(models.Event.id == event_id, models.Event.agent_id == agent_id)
-        .first()
-    )
-    if not ev:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return ev
-
 def _get_player_by_id_or_phone(
     db: Session,
     pid: Optional[int],
@@ -35,11 +36,12 @@ def _get_player_by_id_or_phone(
             .first()
         )
         if p: return p
-    if phone:
+    phone_e164 = to_e164(phone)
+    if phone_e164:
         p = (
             db.query(models.Player)
             .filter(
-                models.Player.phone_number == phone,
+                models.Player.phone_e164 == phone_e164,
                 models.Player.agent_id == agent_id,
             )
             .first()
@@ -47,94 +49,223 @@ def _get_player_by_id_or_phone(
         if p: return p
     raise HTTPException(status_code=404, detail="Player not found")
 
-def _ensure_registered(db: Session, event_id: int, player_id: int, agent_id: int):
-    reg = db.query(models.Registration.id).join(models.Event).filter(
-        models.Registration.event_id == event_id,
-        models.Registration.player_id == player_id,
-        models.Event.agent_id == agent_id,
-    ).first()
-    if not reg:
-        raise HTTPException(status_code=400, detail=f"Player {player_id} not registered for this event")
+def _ensure_registered(db: Session, event_id: int, *player_ids: int):
+    missing = set(player_ids) - registered_player_ids(db, event_id, player_ids)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Player {min(missing)} not registered for this event")
 
 @router.post("/tables/{table_id}/assign", response_model=schemas.AssignmentOut)
-def assign_to_table(
+async def assign_to_table(
     payload: schemas.AssignmentCreate,
     event_id: int = Path(...),
     table_id: int = Path(...),
-    db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    db: AsyncSession = Depends(get_async_db),
+    current_agent: models.Agent = Depends(get_event_agent_async),
 ):
-    event = _get_event(db, event_id, current_agent.id)
+    # Row locks, scheduler rules and the outbox are sync code shared with the
+    # other desk routes; run them on the session's sync facade, off the threadpool.
+    a = await db.run_sync(_assign_to_table, payload, event_id, table_id, current_agent.id)
+    await db.commit()
+    if payload.notify:
+        outbox.wake()
+    await db.refresh(a, ["notified_at", "player1", "player2"])
+    return a
 
+def _assign_to_table(
+    db: Session,
+    payload: schemas.AssignmentCreate,
+    event_id: int,
+    table_id: int,
+    agent_id: int,
+) -> models.Assignment:
+    event = owned_event(db, event_id)
+
+    # Row lock: a second desk assigning this table waits here, then sees it occupied.
     t = db.query(models.Table).filter(
         and_(models.Table.id == table_id, models.Table.event_id == event_id)
-    ).first()
+    ).with_for_update().first()
     if not t:
         raise HTTPException(status_code=404, detail="Table not found for this event")
     if t.status != "free":
         raise HTTPException(status_code=409, detail=f"Table '{t.position}' is not free")
 
-    p1 = _get_player_by_id_or_phone(db, payload.player1_id, payload.player1_phone, current_agent.id)
-    p2 = _get_player_by_id_or_phone(db, payload.player2_id, payload.player2_phone, current_agent.id)
+    p1 = _get_player_by_id_or_phone(db, payload.player1_id, payload.player1_phone, agent_id)
+    p2 = _get_player_by_id_or_phone(db, payload.player2_id, payload.player2_phone, agent_id)
     if p1.id == p2.id:
         raise HTTPException(status_code=400, detail="Choose two different players")
-    _ensure_registered(db, event_id, p1.id, current_agent.id)
-    _ensure_registered(db, event_id, p2.id, current_agent.id)
+    _ensure_registered(db, event_id, p1.id, p2.id)
 
     # Make sure both players are not already active on any table in this event
-    active_for_players = db.query(models.Assignment.id).filter(
-        models.Assignment.event_id == event_id,
-        models.Assignment.status == "active",
-        ((models.Assignment.player1_id.in_([p1.id, p2.id])) |
-         (models.Assignment.player2_id.in_([p1.id, p2.id])))
-    ).first()
-    if active_for_players:
+    lock_players(db, [p1.id, p2.id])
+    if active_player_ids(db, event_id, [p1.id, p2.id]):
         raise HTTPException(status_code=409, detail="One of the players is already assigned to another table")
 
-    now = datetime.now(timezone.utc)
-    a = models.Assignment(
-        event_id=event_id,
-        table_id=t.id,
-        player1_id=p1.id,
-        player2_id=p2.id,
-        status="active",
-        notified_at=None,
-        created_at=now,
-    )
-    db.add(a)
-    db.flush()  # get a.id before commit
-
-    t.status = "occupied"
-    t.current_assignment_id = a.id
+    a = start_assignment(db, t, p1.id, p2.id)
 
     if payload.notify:
+        # Queued in this transaction; app.outbox sends them and sets notified_at.
         try:
-            result = notify_players(
+            enqueue_notifications(
+                db,
                 t,
                 a,
                 (p1, p2),
                 (p2, p1),
                 event.name,
             )
-            a.notified_at = result.timestamp
         except NotificationError as exc:
             raise HTTPException(status_code=502, detail=str(exc))
 
-    db.commit()
-    db.refresh(a)
+    record_board_change(db, event_id, [t.id])
     return a
 
+@router.post("/assignments/bulk", response_model=schemas.BulkAssignmentResult)
+def bulk_assign(
+    payload: schemas.BulkAssignmentCreate,
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    """Seat a whole round in one transaction.
+
+    Everything is validated with a few set-based queries; items that fail a
+    check are reported as conflicts and the rest are committed together.
+    """
+    event = owned_event(db, event_id)
+    if payload.notify:
+        try:
+            check_configured()
+        except NotificationError as exc:
+            raise HTTPException(status_code=502, detail=str(exc))
+
+    items = payload.items
+    tables: Dict[int, models.Table] = {
+        t.id: t
+        for t in db.query(models.Table)
+        .filter(models.Table.event_id == event_id, models.Table.id.in_({i.table_id for i in items}))
+        .order_by(models.Table.id)
+        .with_for_update()
+    }
+
+    wanted_ids = {pid for i in items for pid in (i.player1_id, i.player2_id) if pid is not None}
+    wanted_phones = {to_e164(ph) for i in items for ph in (i.player1_phone, i.player2_phone) if ph} - {None}
+    by_id: Dict[int, models.Player] = {}
+    by_phone: Dict[str, models.Player] = {}
+    if wanted_ids:
+        by_id = {
+            p.id: p
+            for p in db.query(models.Player).filter(
+                models.Player.agent_id == current_agent.id, models.Player.id.in_(wanted_ids)
+            )
+        }
+    if wanted_phones:
+        by_phone = {
+            p.phone_e164: p
+            for p in db.query(models.Player).filter(
+                models.Player.agent_id == current_agent.id, models.Player.phone_e164.in_(wanted_phones)
+            )
+        }
+
+    def resolve(pid: Optional[int], phone: Optional[str]) -> Optional[models.Player]:
+        if pid is not None and pid in by_id:
+            return by_id[pid]
+        if phone:
+            return by_phone.get(to_e164(phone))
+        return None
+
+    resolved = [
+        (resolve(i.player1_id, i.player1_phone), resolve(i.player2_id, i.player2_phone)) for i in items
+    ]
+    candidate_ids = {p.id for pair in resolved for p in pair if p is not None}
+    lock_players(db, candidate_ids)
+    registered = registered_player_ids(db, event_id, candidate_ids)
+    busy = active_player_ids(db, event_id, candidate_ids)
+
+    results: List[schemas.BulkAssignmentItemResult] = []
+    seated_tables: Set[int] = set()
+    seated_players: Set[int] = set()
+    created: List[tuple] = []
+    for index, (item, (p1, p2)) in enumerate(zip(items, resolved)):
+        t = tables.get(item.table_id)
+        detail = None
+        if not t:
+            detail = "Table not found for this event"
+        elif t.status != "free" or t.id in seated_tables:
+            detail = f"Table '{t.position}' is not free"
+        elif not p1 or not p2:
+            detail = "Player not found"
+        elif p1.id == p2.id:
+            detail = "Choose two different players"
+        elif not {p1.id, p2.id} <= registered:
+            missing = min({p1.id, p2.id} - registered)
+            detail = f"Player {missing} not registered for this event"
+        elif {p1.id, p2.id} & (busy | seated_players):
+            detail = "One of the players is already assigned to another table"
+        elif payload.notify and not (p1.phone_e164 and p2.phone_e164):
+            detail = "Both players need a phone number to be notified"
+        if detail:
+            results.append(
+                schemas.BulkAssignmentItemResult(index=index, table_id=item.table_id, status="conflict", detail=detail)
+            )
+            continue
+        seated_tables.add(t.id)
+        seated_players.update((p1.id, p2.id))
+        created.append((index, t, p1, p2))
+        results.append(schemas.BulkAssignmentItemResult(index=index, table_id=t.id, status="created"))
+
+    if not created:
+        return schemas.BulkAssignmentResult(created=0, conflicts=len(results), items=results)
+
+    now = datetime.now(timezone.utc)
+    assignments = [
+        models.Assignment(
+            event_id=event_id,
+            table_id=t.id,
+            player1_id=p1.id,
+            player2_id=p2.id,
+            status="active",
+            notified_at=None,
+            created_at=now,
+        )
+        for _, t, p1, p2 in created
+    ]
+    db.add_all(assignments)
+    db.flush()  # one multi-row INSERT ... RETURNING for the ids
+
+    messages = []
+    for a, (index, t, p1, p2) in zip(assignments, created):
+        t.status = "occupied"
+        t.current_assignment_id = a.id
+        if payload.notify:
+            messages.extend(outbox_messages(t, a, (p1, p2), (p2, p1), event.name))
+        results[index].assignment = schemas.AssignmentOut.model_validate(a)
+    enqueue_messages(db, messages)
+
+    record_board_change(db, event_id, seated_tables)
+    db.commit()
+    return schemas.BulkAssignmentResult(
+        created=len(created),
+        conflicts=len(results) - len(created),
+        items=results,
+    )
+
+
 @router.post("/tables/{table_id}/free", response_model=schemas.TableOut)
-def free_table(
+async def free_table(
     event_id: int = Path(...),
     table_id: int = Path(...),
-    db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    db: AsyncSession = Depends(get_async_db),
+    current_agent: models.Agent = Depends(get_event_agent_async),
 ):
-    _get_event(db, event_id, current_agent.id)
+    t = await db.run_sync(_free_table, event_id, table_id)
+    await db.commit()
+    await db.refresh(t)
+    return t
+
+def _free_table(db: Session, event_id: int, table_id: int) -> models.Table:
     t = db.query(models.Table).filter(
         and_(models.Table.id == table_id, models.Table.event_id == event_id)
-    ).first()
+    ).with_for_update().first()
     if not t:
         raise HTTPException(status_code=404, detail="Table not found for this event")
 
@@ -145,8 +276,8 @@ def free_table(
             a.ended_at = datetime.now(timezone.utc)
     t.status = "free"
     t.current_assignment_id = None
-    db.commit()
-    db.refresh(t)
+    fill_table(db, event_id, t)
+    record_board_change(db, event_id, [t.id])
     return t
 
 @router.post("/assignments/{assignment_id}/move", response_model=schemas.AssignmentOut)
@@ -155,35 +286,52 @@ def move_assignment(
     event_id: int = Path(...),
     assignment_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event(db, event_id, current_agent.id)
     a = db.query(models.Assignment).filter(
         and_(models.Assignment.id == assignment_id, models.Assignment.event_id == event_id)
     ).first()
     if not a or a.status != "active":
         raise HTTPException(status_code=404, detail="Active assignment not found")
 
-    new_t = db.query(models.Table).filter(
-        and_(models.Table.id == payload.new_table_id, models.Table.event_id == event_id)
-    ).first()
+    # Lock both tables (in id order, like every other writer) before re-reading the assignment.
+    old_table_id = a.table_id
+    locked = {
+        t.id: t
+        for t in db.query(models.Table)
+        .filter(models.Table.event_id == event_id, models.Table.id.in_({payload.new_table_id, old_table_id} - {None}))
+        .order_by(models.Table.id)
+        .with_for_update()
+        .populate_existing()
+    }
+    db.refresh(a)
+    if a.status != "active" or a.table_id != old_table_id:
+        raise HTTPException(status_code=409, detail="Assignment changed meanwhile, please retry")
+
+    new_t = locked.get(payload.new_table_id)
     if not new_t:
         raise HTTPException(status_code=404, detail="Target table not found")
     if new_t.status != "free":
         raise HTTPException(status_code=409, detail="Target table is not free")
 
     # free old table
+    changed_tables = [new_t.id]
+    old_t = None
     if a.table_id:
-        old_t = db.query(models.Table).filter(models.Table.id == a.table_id).first()
+        old_t = locked.get(a.table_id)
         if old_t:
             old_t.status = "free"
             old_t.current_assignment_id = None
+            changed_tables.append(old_t.id)
 
     # occupy new table
     a.table_id = new_t.id
     new_t.status = "occupied"
     new_t.current_assignment_id = a.id
 
+    if old_t:
+        fill_table(db, event_id, old_t)
+    record_board_change(db, event_id, changed_tables)
     db.commit()
     db.refresh(a)
     return a
@@ -194,9 +342,9 @@ def notify_assignment(
     event_id: int = Path(...),
     assignment_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    event = _get_event(db, event_id, current_agent.id)
+    event = owned_event(db, event_id)
     assignment = db.query(models.Assignment).filter(
         and_(models.Assignment.id == assignment_id, models.Assignment.event_id == event_id)
     ).first()
@@ -207,7 +355,8 @@ def notify_assignment(
         raise HTTPException(status_code=400, detail="Assignment does not have a table")
 
     try:
-        result = notify_players(
+        enqueue_notifications(
+            db,
             table,
             assignment,
             (assignment.player1, assignment.player2),
@@ -217,8 +366,8 @@ def notify_assignment(
     except NotificationError as exc:
         raise HTTPException(status_code=502, detail=str(exc))
 
-    assignment.notified_at = result.timestamp
     db.commit()
+    outbox.wake()
     db.refresh(assignment)
     return assignment
 
@@ -228,9 +377,8 @@ def start_assignment_timer(
     event_id: int = Path(...),
     assignment_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event(db, event_id, current_agent.id)
     assignment = db.query(models.Assignment).filter(
         and_(models.Assignment.id == assignment_id, models.Assignment.event_id == event_id)
     ).first()
@@ -239,6 +387,7 @@ def start_assignment_timer(
 
     assignment.started_at = datetime.now(timezone.utc)
     assignment.ended_at = None
+    record_board_change(db, event_id, [assignment.table_id] if assignment.table_id else [])
     db.commit()
     db.refresh(assignment)
     return assignment
@@ -248,11 +397,16 @@ def swap_tables(
     payload: schemas.SwapTables,
     event_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event(db, event_id, current_agent.id)
-    ta = db.query(models.Table).filter(and_(models.Table.id == payload.table_a_id, models.Table.event_id == event_id)).first()
-    tb = db.query(models.Table).filter(and_(models.Table.id == payload.table_b_id, models.Table.event_id == event_id)).first()
+    locked = {
+        t.id: t
+        for t in db.query(models.Table)
+        .filter(models.Table.event_id == event_id, models.Table.id.in_([payload.table_a_id, payload.table_b_id]))
+        .order_by(models.Table.id)
+        .with_for_update()
+    }
+    ta, tb = locked.get(payload.table_a_id), locked.get(payload.table_b_id)
     if not ta or not tb:
         raise HTTPException(status_code=404, detail="One or both tables not found")
 
@@ -265,10 +419,15 @@ def swap_tables(
     if not aa or not ab or aa.status != "active" or ab.status != "active":
         raise HTTPException(status_code=400, detail="Assignments must be active to swap")
 
-    # swap
-    aa.table_id, ab.table_id = tb.id, ta.id
+    # swap one step at a time so the one-active-match-per-table index never sees two
+    aa.table_id = None
+    db.flush()
+    ab.table_id = ta.id
+    db.flush()
+    aa.table_id = tb.id
     ta.current_assignment_id, tb.current_assignment_id = ab.id, aa.id
 
+    record_board_change(db, event_id, [ta.id, tb.id])
     db.commit()
     db.refresh(ta); db.refresh(tb)
     return [ta, tb]
@@ -3,27 +3,40 @@
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..db import get_db
-from ..security import verify_password
+from ..hashing import verify_password_async
+from ..security import invalidate_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/login", response_model=schemas.AgentLoginResponse)
-def login(payload: schemas.AgentLoginRequest, db: Session = Depends(get_db)):
-    agent = db.query(models.Agent).filter(models.Agent.email == payload.email.lower()).first()
+def _find_agent(db: Session, email: str):
+    return db.query(models.Agent).filter(models.Agent.email == email).first()
 
-    if not agent or not verify_password(payload.password, agent.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
-        )
 
+def _rotate_token(db: Session, agent: models.Agent) -> str:
     token = secrets.token_urlsafe(32)
+    invalidate_token(db, agent.api_token)
     agent.api_token = token
     db.commit()
     db.refresh(agent)
+    return token
+
+
+@router.post("/login", response_model=schemas.AgentLoginResponse)
+async def login(payload: schemas.AgentLoginRequest, db: Session = Depends(get_db)):
+    # Async so the bcrypt check waits on the hashing pool, not on a request thread.
+    agent = await run_in_threadpool(_find_agent, db, payload.email.lower())
+
+    if not agent or not await verify_password_async(payload.password, agent.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
+        )
+
+    token = await run_in_threadpool(_rotate_token, db, agent)
 
     return schemas.AgentLoginResponse(agent=agent, token=token)
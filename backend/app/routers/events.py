@@ -3,14 +3,15 @@ from typing import List
 from fastapi import APIRouter, Depends , HTTPException , Path
 from sqlalchemy.orm import Session
 from ..db import get_db
+from ..replicas import get_read_db
 from .. import models, schemas
-from ..security import get_current_agent
+from ..security import forget_event, get_current_agent
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 @router.get("", response_model=List[schemas.EventOut])
 def list_events(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
     return (
@@ -53,5 +54,6 @@ def delete_event(
         raise HTTPException(status_code=404, detail="Event not found")
 
     db.delete(event)
+    forget_event(db, event_id)
     db.commit()
     return None
\ No newline at end of file
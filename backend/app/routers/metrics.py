@@ -0,0 +1,26 @@
+"""Operational metrics for the worker pools, for signed-in agents."""
+
+from fastapi import APIRouter, Depends
+
+from .. import hashing
+from ..db import async_engine, async_replica_engine, engine, replica_engine
+from ..dbpool import pool_stats
+from ..security import get_current_agent
+
+router = APIRouter(prefix="/metrics", tags=["meta"])
+
+
+@router.get("/hashing", dependencies=[Depends(get_current_agent)])
+def hashing_metrics():
+    """Password-hash pool: queue depth, in-flight, rejections and latency percentiles."""
+    return hashing.stats()
+
+
+@router.get("/db-pool", dependencies=[Depends(get_current_agent)])
+def db_pool_metrics():
+    """Both engines' pools: checked-out and overflow connections, checkout waits and timeouts."""
+    pools = {"sync": pool_stats(engine.pool), "async": pool_stats(async_engine.pool)}
+    if replica_engine is not None:
+        pools["replica_sync"] = pool_stats(replica_engine.pool)
+        pools["replica_async"] = pool_stats(async_replica_engine.pool)
+    return pools
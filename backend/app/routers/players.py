@@ -1,16 +1,35 @@
-from typing import List, Optional, Sequence, Tuple
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import csv
 import io
+import itertools
+import logging
 import math
+import os
+import shutil
+import tempfile
+import threading
+import uuid
 
 from pathlib import Path as FsPath
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Path as ParamPath
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Path as ParamPath, Query, Request, Response
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 
-from ..db import get_db
+from ..config import settings
+from ..db import SessionLocal, get_db
+from ..pagination import MAX_PAGE_SIZE, contains_pattern, paginate
 from .. import models, schemas
-from ..security import get_current_agent
+from ..phones import to_e164
+from ..player_search import MAX_RESULTS as MAX_SEARCH_RESULTS, search_players
+from ..replicas import get_async_read_db, get_read_db
+from ..security import get_current_agent, get_current_agent_async, get_event_agent, owned_event
+from ..versioning import bump_players_version, etag_matches, not_modified, players_etag, set_etag
 
 try:  # pragma: no cover - optional dependency handled at runtime
     from openpyxl import load_workbook  # type: ignore
@@ -18,8 +37,21 @@ except Exception:  # pragma: no cover - handled in endpoint
     load_workbook = None
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/players", tags=["players"]) #endpoint /players
-MAX_BULK_IMPORT_ROWS = 200 # to prevent abuse
+event_router = APIRouter(prefix="/events/{event_id}/players", tags=["players"])
+MAX_BULK_IMPORT_ROWS = 100_000 # to prevent abuse
+IMPORT_BATCH_SIZE = 1000  # rows per INSERT ... ON CONFLICT statement
+MAX_JOB_ERRORS = 1000  # error messages kept on a background job; the rest are only counted
+
+# Background imports (POST /players/import?background=true) run here, off the request workers.
+_import_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_JOB_WORKERS, thread_name_prefix="player-import")
+# This process's unfinished jobs, queued or running, kept fresh by the heartbeat.
+_local_jobs: Set[uuid.UUID] = set()
+_local_jobs_lock = threading.Lock()
+_heartbeat_stop = threading.Event()
+_heartbeat_thread: Optional[threading.Thread] = None
 
 
 SUPPORTED_EXCEL_SUFFIXES = {".xlsx", ".xlsm", ".xltx", ".xltm"}
@@ -47,32 +79,31 @@ def _detect_file_format(file: UploadFile) -> str:
     )
 
 
-def _read_csv_rows(data: bytes) -> List[Tuple[int, List[str]]]:
+def _read_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, List[str]]]:
+    """Yield non-blank CSV rows, decoding the upload incrementally."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
     try:
-        text = data.decode("utf-8-sig")
+        for row_number, row in enumerate(csv.reader(text), start=1):
+            if not any(cell.strip() for cell in row):
+                continue
+            yield row_number, row
     except UnicodeDecodeError:
         raise HTTPException(
             status_code=400,
             detail="Could not decode the uploaded file. Please make sure it is a valid UTF-8 encoded CSV file.",
         )
+    finally:
+        text.detach()  # leave the upload open; UploadFile closes it
 
-    reader = csv.reader(io.StringIO(text))
-    rows: List[Tuple[int, List[str]]] = []
-    for row_number, row in enumerate(reader, start=1):
-        if not any(cell.strip() for cell in row):
-            continue
-        rows.append((row_number, row))
-    return rows
 
-
-def _read_excel_rows(data: bytes) -> List[Tuple[int, List[Optional[object]]]]:
+def _read_excel_rows(stream: BinaryIO) -> Iterator[Tuple[int, List[Optional[object]]]]:
+    """Yield non-blank rows of the active sheet without loading the whole sheet."""
     if load_workbook is None:
         raise HTTPException(
             status_code=400,
             detail="Excel support is unavailable on the server.",
         )
 
-    stream = io.BytesIO(data)
     try:
         workbook = load_workbook(stream, read_only=True, data_only=True)
     except Exception:
@@ -81,13 +112,14 @@ def _read_excel_rows(data: bytes) -> List[Tuple[int, List[Optional[object]]]]:
             detail="Unable to read the Excel file. Please upload a valid .xlsx workbook.",
         )
 
-    worksheet = workbook.active
-    rows: List[Tuple[int, List[Optional[object]]]] = []
-    for row_number, row in enumerate(worksheet.iter_rows(values_only=True), start=1):
-        if not any(cell is not None and str(cell).strip() for cell in row):
-            continue
-        rows.append((row_number, list(row)))
-    return rows
+    try:
+        worksheet = workbook.active
+        for row_number, row in enumerate(worksheet.iter_rows(values_only=True), start=1):
+            if not any(cell is not None and str(cell).strip() for cell in row):
+                continue
+            yield row_number, list(row)
+    finally:
+        workbook.close()
 
 
 def _normalise_full_name(value: Optional[object]) -> str:
@@ -128,17 +160,17 @@ def _looks_like_header_row(full_name: str, phone_number: Optional[str]) -> bool:
     return phone_key in PHONE_HEADERS or phone_key == ""
 
 
-def _extract_player_rows(rows: Sequence[Tuple[int, Sequence[Optional[object]]]]) -> List[Tuple[int, str, Optional[str]]]:
-    extracted: List[Tuple[int, str, Optional[str]]] = []
+def _extract_player_rows(
+    rows: Iterable[Tuple[int, Sequence[Optional[object]]]],
+) -> Iterator[Tuple[int, str, Optional[str]]]:
     full_idx = 0
     phone_idx = 1
-    header_detected = False
 
     iterator = iter(rows)
     try:
         first_row_number, first_values = next(iterator)
     except StopIteration:
-        return extracted
+        return
 
     normalised_header = [
         str(value).strip().lower().replace(" ", "_") if value is not None else ""
@@ -156,79 +188,103 @@ def _extract_player_rows(rows: Sequence[Tuple[int, Sequence[Optional[object]]]])
     if detected_full_idx is not None and detected_phone_idx is not None:
         full_idx = detected_full_idx
         phone_idx = detected_phone_idx
-        header_detected = True
     else:
         # Treat the first row as data
-        iterator = iter(rows)
-
-    if not header_detected:
-        first_row_number, first_values = next(iterator)
-        extracted.append(
-            (
-                first_row_number,
-                _normalise_full_name(first_values[full_idx] if len(first_values) > full_idx else None),
-                _normalise_phone_number(first_values[phone_idx] if len(first_values) > phone_idx else None),
-            )
-        )
+        iterator = itertools.chain([(first_row_number, first_values)], iterator)
 
     for row_number, values in iterator:
         full_value = values[full_idx] if len(values) > full_idx else None
         phone_value = values[phone_idx] if len(values) > phone_idx else None
-        extracted.append(
-            (
-                row_number,
-                _normalise_full_name(full_value),
-                _normalise_phone_number(phone_value),
-            )
+        yield (
+            row_number,
+            _normalise_full_name(full_value),
+            _normalise_phone_number(phone_value),
         )
 
-    return extracted
-
 
-def _parse_player_rows(file: UploadFile, raw: bytes) -> List[Tuple[int, str, Optional[str]]]:
-    file_format = _detect_file_format(file)
+def _parse_player_rows(stream: BinaryIO, file_format: str) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """Lazily parse the upload; rows are read as the importer consumes them."""
+    stream.seek(0)
     if file_format == "csv":
-        base_rows = _read_csv_rows(raw)
+        base_rows = _read_csv_rows(stream)
     else:
-        base_rows = _read_excel_rows(raw)
+        base_rows = _read_excel_rows(stream)
+    return _extract_player_rows(base_rows)
 
-    if not base_rows:
-        return []
 
-    try:
-        players = _extract_player_rows(base_rows)
-    except StopIteration:
-        return []
-
-    return players
+def _upload_is_empty(file: UploadFile) -> bool:
+    stream = file.file
+    stream.seek(0, io.SEEK_END)
+    empty = stream.tell() == 0
+    stream.seek(0)
+    return empty
 
 
 @router.get("", response_model=List[schemas.PlayerOut])
-def list_players(
+async def list_players(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    name: Optional[str] = Query(None, min_length=1),
+    registered_in: Optional[int] = Query(None, description="Only players registered for this event"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_agent: models.Agent = Depends(get_current_agent_async),
+):
+    # The ETag reads players_version, which a cached identity loads lazily: sync facade.
+    return await db.run_sync(_list_players, request, response, current_agent, limit, cursor, name, registered_in)
+
+def _list_players(
+    db: Session,
+    request: Request,
+    response: Response,
+    current_agent: models.Agent,
+    limit: Optional[int],
+    cursor: Optional[str],
+    name: Optional[str],
+    registered_in: Optional[int],
+):
+    if registered_in is not None:
+        event = _get_event_or_404(db, registered_in, current_agent.id)
+        # Registrations bump the event version, not the players version.
+        etag = players_etag(current_agent.id, _players_version(db, current_agent), event.id, event.state_version)
+    else:
+        etag = players_etag(current_agent.id, _players_version(db, current_agent))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    query = db.query(models.Player).filter(models.Player.agent_id == current_agent.id)
+    if registered_in is not None:
+        query = query.join(
+            models.Registration,
+            (models.Registration.player_id == models.Player.id) & (models.Registration.event_id == registered_in),
+        )
+    if name:
+        query = query.filter(models.Player.full_name.ilike(contains_pattern(name), escape="\\"))
+    return paginate(query, models.Player, response, limit, cursor) #players newest first, one page if limit is given
+
+@router.get("/search", response_model=List[schemas.PlayerSearchHit]) #desk autocomplete
+def search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(MAX_SEARCH_RESULTS, ge=1, le=MAX_SEARCH_RESULTS),
     db: Session = Depends(get_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
-    return (
-        db.query(models.Player)
-        .filter(models.Player.agent_id == current_agent.id)
-        .order_by(models.Player.created_at.desc())
-        .all()
-    ) #list all players ordered by created_at desc
+    """Accent-insensitive prefix/substring match on name, and substring match on phone digits."""
+    return [
+        schemas.PlayerSearchHit(id=pid, full_name=full_name, phone_number=phone)
+        for pid, full_name, phone in search_players(db, current_agent, q, limit)
+    ]
+
 
 @router.get("/{phone_number}", response_model=schemas.PlayerOut) #get player by phone number
 def get_player(
     phone_number: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
-    player = (
-        db.query(models.Player)
-        .filter(
-            models.Player.phone_number == phone_number,
-            models.Player.agent_id == current_agent.id,
-        )
-        .first()
-    )
+    player = _get_player_by_phone(db, phone_number, current_agent.id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
@@ -240,51 +296,82 @@ def create_player(
     db: Session = Depends(get_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
-    existsing_player = (
-        db.query(models.Player)
-        .filter(
-            models.Player.phone_number == payload.phone_number,
-            models.Player.agent_id == current_agent.id,
-        )
-        .first()
-    )
+    phone_e164 = _require_e164(payload.phone_number)
+    existsing_player = _get_player_by_phone(db, phone_e164, current_agent.id)
     if existsing_player:
         raise HTTPException(status_code=400 , detail="This phone number already exists in the Player database")
     player=models.Player(
         agent_id=current_agent.id,
         full_name=payload.full_name,
-        phone_number=payload.phone_number
+        phone_number=payload.phone_number,
+        phone_e164=phone_e164,
     )
     db.add(player)
+    bump_players_version(db, current_agent.id)
     db.commit()
     db.refresh(player)
     return player
 
-async def _bulk_import_players(
-    file: UploadFile,
-    db: Session,
-    current_agent: models.Agent,
-) -> schemas.BulkImportResult:
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+def _insert_player_batch(db: Session, agent_id: int, batch: List[Tuple[int, dict]], errors: List[str]) -> int:
+    """Insert a batch with one statement; report rows whose phone already exists.
+
+    If the statement fails, the halves are retried in their own savepoints
+    down to single rows, so the good rows are kept and only the rows that
+    fail are reported. Returns the number of players created.
+    """
+    stmt = (
+        insert(models.Player)
+        .values([values for _, values in batch])
+        .on_conflict_do_nothing()  # un_agent_phone_e164, or the raw-number constraint
+        .returning(models.Player.phone_e164)
+    )
+    try:
+        with db.begin_nested():
+            inserted = db.execute(stmt).all()
+    except DBAPIError as exc:
+        if len(batch) == 1:
+            logger.info("player import: row %s rejected: %s", batch[0][0], exc.orig)
+            errors.append(f"Row {batch[0][0]}: could not be saved ({_short_db_error(exc)}).")
+            return 0
+        middle = len(batch) // 2
+        return _insert_player_batch(db, agent_id, batch[:middle], errors) + _insert_player_batch(
+            db, agent_id, batch[middle:], errors
+        )
 
-    rows = _parse_player_rows(file, raw)
-    if not rows:
-        raise HTTPException(status_code=400, detail="No player rows found in the uploaded file.")
+    inserted_phones = {pn for (pn,) in inserted}
+    for row_number, values in batch:
+        phone_value = values["phone_number"]
+        if values["phone_e164"] is not None and values["phone_e164"] not in inserted_phones:
+            errors.append(f"Row {row_number}: phone_number '{phone_value}' already exists.")
+    if inserted:
+        bump_players_version(db, agent_id)
+    return len(inserted)
 
-    existing_phone_numbers = {
-        str(pn).strip()
-        for (pn,) in db.query(models.Player.phone_number)
-        .filter(models.Player.agent_id == current_agent.id)
-        .all()
-        if pn
-    }
 
+def _short_db_error(exc: DBAPIError) -> str:
+    # The driver's first line, without the statement and parameters SQLAlchemy appends.
+    lines = str(exc.orig).strip().splitlines()
+    return (lines[0] if lines else type(exc.orig).__name__)[:200]
+
+
+def _import_player_rows(
+    db: Session,
+    rows: Iterable[Tuple[int, str, Optional[str]]],
+    agent_id: int,
+    on_batch: Optional[Callable[[int, int, List[str]], bool]] = None,
+) -> schemas.BulkImportResult:
+    """Validate and insert parsed rows in batches; does not commit.
+
+    ``on_batch(processed, created, errors)`` runs after every full batch;
+    returning False stops the import there (used by background jobs).
+    """
     created_count = 0
     processed = 0
     errors: List[str] = []
+    seen_phone_numbers: Set[str] = set()
+    batch: List[Tuple[int, dict]] = []
 
+    idx = 0
     for idx, (row_number, full_name, phone_number) in enumerate(rows, start=1):
         if processed >= MAX_BULK_IMPORT_ROWS:
             errors.append(
@@ -302,25 +389,35 @@ async def _bulk_import_players(
             continue
 
         phone_value = phone_number.strip() if isinstance(phone_number, str) else phone_number
-        if phone_value and phone_value in existing_phone_numbers:
-            errors.append(f"Row {row_number}: phone_number '{phone_value}' already exists.")
-            continue
-
-        player = models.Player(
-            agent_id=current_agent.id,
-            full_name=full_name,
-            phone_number=phone_value,
+        phone_e164 = None
+        if phone_value:
+            phone_e164 = to_e164(phone_value)
+            if phone_e164 is None:
+                errors.append(f"Row {row_number}: phone_number '{phone_value}' is not a valid phone number.")
+                continue
+            # Duplicates within the file; duplicates of stored players are caught by ON CONFLICT.
+            if phone_e164 in seen_phone_numbers:
+                errors.append(f"Row {row_number}: phone_number '{phone_value}' already exists.")
+                continue
+            seen_phone_numbers.add(phone_e164)
+
+        batch.append(
+            (
+                row_number,
+                {"agent_id": agent_id, "full_name": full_name, "phone_number": phone_value, "phone_e164": phone_e164},
+            )
         )
-        db.add(player)
-        try:
-            db.commit()
-            db.refresh(player)
-            created_count += 1
-            if phone_value:
-                existing_phone_numbers.add(phone_value)
-        except Exception as e:
-            db.rollback()
-            errors.append(f"Row {row_number}: Database error: {str(e)}")
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            created_count += _insert_player_batch(db, agent_id, batch, errors)
+            batch = []
+            if on_batch is not None and not on_batch(processed, created_count, errors):
+                break
+
+    if idx == 0:
+        raise HTTPException(status_code=400, detail="No player rows found in the uploaded file.")
+
+    if batch:
+        created_count += _insert_player_batch(db, agent_id, batch, errors)
 
     return schemas.BulkImportResult(
         total_rows=processed,
@@ -330,23 +427,236 @@ async def _bulk_import_players(
     )
 
 
-@router.post("/import", response_model=schemas.BulkImportResult)
-async def import_players(
+def _bulk_import_players(
+    file: UploadFile,
+    db: Session,
+    current_agent: models.Agent,
+) -> schemas.BulkImportResult:
+    if _upload_is_empty(file):
+        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+
+    # Rows stream from the spooled upload straight into insert batches, so
+    # memory is bounded by IMPORT_BATCH_SIZE rather than by the file size.
+    rows = _parse_player_rows(file.file, _detect_file_format(file))
+    result = _import_player_rows(db, rows, current_agent.id)
+    db.commit()
+    return result
+
+
+def _run_import_job(job_id: uuid.UUID, path: str, file_format: str) -> None:
+    """Worker body of a background import; commits after every batch."""
+    try:
+        with SessionLocal() as db:
+            job = db.get(models.ImportJob, job_id)
+            if job is None:
+                return
+            if job.status != "queued":  # failed as stale while it waited
+                return
+            if job.cancel_requested:
+                job.status = "cancelled"
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+                return
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            db.commit()
+
+            cancelled = False
+            kept: List[str] = []
+
+            def record_errors(errors: List[str]) -> None:
+                # Only the first MAX_JOB_ERRORS are stored, so a file full of bad
+                # rows does not rewrite an ever longer list on every batch.
+                if len(kept) < MAX_JOB_ERRORS and len(errors) > len(kept):
+                    kept.extend(errors[len(kept):MAX_JOB_ERRORS])
+                    job.errors = list(kept)
+                job.error_count = len(errors)
+
+            def on_batch(processed: int, created: int, errors: List[str]) -> bool:
+                nonlocal cancelled
+                job.total_rows = processed
+                job.created = created
+                job.skipped = processed - created
+                record_errors(errors)
+                db.commit()  # also expires job, so the next read sees a cancel request
+                cancelled = job.cancel_requested
+                return not cancelled
+
+            try:
+                with open(path, "rb") as stream:
+                    result = _import_player_rows(db, _parse_player_rows(stream, file_format), job.agent_id, on_batch)
+            except HTTPException as exc:
+                db.rollback()
+                job.status = "failed"
+                job.detail = str(exc.detail)
+            except Exception:
+                db.rollback()
+                logger.exception("player import job %s failed", job_id)
+                job.status = "failed"
+                job.detail = "Import failed unexpectedly."
+            else:
+                job.total_rows = result.total_rows
+                job.created = result.created
+                job.skipped = result.skipped
+                record_errors(result.errors)
+                job.status = "cancelled" if cancelled else "completed"
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+    finally:
+        with _local_jobs_lock:
+            _local_jobs.discard(job_id)
+        os.unlink(path)
+
+
+def fail_stale_import_jobs() -> int:
+    """Fail jobs left queued or running by a process that has gone away.
+
+    Called at startup. Every process touches its unfinished jobs each
+    IMPORT_JOB_HEARTBEAT_SECONDS, including those still waiting for an
+    executor thread, so a job not updated for IMPORT_JOB_STALE_SECONDS has
+    lost its process.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.IMPORT_JOB_STALE_SECONDS)
+    with SessionLocal() as db:
+        failed = (
+            db.query(models.ImportJob)
+            .filter(models.ImportJob.status.in_(("queued", "running")), models.ImportJob.updated_at < cutoff)
+            .update(
+                {
+                    "status": "failed",
+                    "detail": "Interrupted by a server restart; upload the file again.",
+                    "finished_at": datetime.now(timezone.utc),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    if failed:
+        logger.warning("marked %d interrupted player import jobs as failed", failed)
+    return failed
+
+
+def _touch_local_jobs() -> None:
+    with _local_jobs_lock:
+        job_ids = list(_local_jobs)
+    if not job_ids:
+        return
+    with SessionLocal() as db:
+        (
+            db.query(models.ImportJob)
+            .filter(models.ImportJob.id.in_(job_ids), models.ImportJob.status.in_(("queued", "running")))
+            .update({"updated_at": func.now()}, synchronize_session=False)
+        )
+        db.commit()
+
+
+def _heartbeat() -> None:
+    while not _heartbeat_stop.wait(settings.IMPORT_JOB_HEARTBEAT_SECONDS):
+        try:
+            _touch_local_jobs()
+        except Exception:
+            logger.exception("player import job heartbeat failed")
+
+
+def start_import_heartbeat() -> None:
+    global _heartbeat_thread
+    if _heartbeat_thread is not None:
+        return
+    _heartbeat_stop.clear()
+    _heartbeat_thread = threading.Thread(target=_heartbeat, name="player-import-heartbeat", daemon=True)
+    _heartbeat_thread.start()
+
+
+def stop_import_heartbeat() -> None:
+    global _heartbeat_thread
+    if _heartbeat_thread is None:
+        return
+    _heartbeat_stop.set()
+    _heartbeat_thread.join(timeout=10)
+    _heartbeat_thread = None
+
+
+def _start_import_job(file: UploadFile, db: Session, current_agent: models.Agent) -> models.ImportJob:
+    if _upload_is_empty(file):
+        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+    file_format = _detect_file_format(file)
+
+    # The upload is gone once the response is sent; keep a copy for the worker.
+    with tempfile.NamedTemporaryFile(prefix="player-import-", delete=False) as tmp:
+        shutil.copyfileobj(file.file, tmp)
+
+    job = models.ImportJob(agent_id=current_agent.id, filename=file.filename, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    with _local_jobs_lock:
+        _local_jobs.add(job.id)
+    _import_executor.submit(_run_import_job, job.id, tmp.name, file_format)
+    return job
+
+
+def _get_import_job(db: Session, job_id: uuid.UUID, agent_id: int) -> models.ImportJob:
+    job = (
+        db.query(models.ImportJob)
+        .filter(models.ImportJob.id == job_id, models.ImportJob.agent_id == agent_id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.post(
+    "/import",
+    response_model=Union[schemas.ImportJobOut, schemas.BulkImportResult],
+    responses={202: {"model": schemas.ImportJobOut}},
+)
+def import_players(
+    response: Response,
     file: UploadFile = File(...),
+    background: bool = False,
     db: Session = Depends(get_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
-    return await _bulk_import_players(file, db, current_agent)
+    """Import a roster. With ``?background=true`` return a job to poll instead of waiting."""
+    if background:
+        response.status_code = 202
+        return _start_import_job(file, db, current_agent)
+    return _bulk_import_players(file, db, current_agent)
 
 
 @router.post("/import-csv", response_model=schemas.BulkImportResult)
-async def import_players_csv(
+def import_players_csv(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
     """Backward compatible endpoint that shares the same importer."""
-    return await _bulk_import_players(file, db, current_agent)
+    return _bulk_import_players(file, db, current_agent)
+
+
+@router.get("/import/{job_id}", response_model=schemas.ImportJobOut)
+def get_import_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_current_agent),
+):
+    return _get_import_job(db, job_id, current_agent.id)
+
+
+@router.delete("/import/{job_id}", response_model=schemas.ImportJobOut)
+def cancel_import_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_current_agent),
+):
+    """Ask a queued or running import to stop; batches already committed are kept."""
+    job = _get_import_job(db, job_id, current_agent.id)
+    if job.status in ("queued", "running"):
+        job.cancel_requested = True
+        db.commit()
+        db.refresh(job)
+    return job
 
 #------------Alter Player----------------
 #alter phone number
@@ -357,31 +667,20 @@ def update_player(
     db: Session = Depends(get_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
-    player = (
-        db.query(models.Player)
-        .filter(
-            models.Player.phone_number == phone_number,
-            models.Player.agent_id == current_agent.id,
-        )
-        .first()
-    )
+    player = _get_player_by_phone(db, phone_number, current_agent.id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found with that number")
     
-    if payload.phone_number != phone_number:
+    new_e164 = _require_e164(payload.phone_number)
+    if new_e164 != player.phone_e164:
         # Check for uniqueness of new phone number
-        existing_player = (
-            db.query(models.Player)
-            .filter(
-                models.Player.phone_number == payload.phone_number,
-                models.Player.agent_id == current_agent.id,
-            )
-            .first()
-        )
+        existing_player = _get_player_by_phone(db, new_e164, current_agent.id)
         if existing_player:
             raise HTTPException(status_code=400, detail="This new phone number already exists in the Player database")
     
     player.phone_number = payload.phone_number
+    player.phone_e164 = new_e164
+    bump_players_version(db, current_agent.id)
     db.commit()
     db.refresh(player)
     return player
@@ -401,6 +700,7 @@ def delete_player_by_id(
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     db.delete(player)
+    bump_players_version(db, current_agent.id)
     db.commit()
     return None
 
@@ -411,17 +711,11 @@ def delete_player(
     db: Session = Depends(get_db),
     current_agent: models.Agent = Depends(get_current_agent),
 ):
-    player = (
-        db.query(models.Player)
-        .filter(
-            models.Player.phone_number == phone_number,
-            models.Player.agent_id == current_agent.id,
-        )
-        .first()
-    )
+    player = _get_player_by_phone(db, phone_number, current_agent.id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found with that number")
     db.delete(player)
+    bump_players_version(db, current_agent.id)
     db.commit()
     return None
 
@@ -435,6 +729,7 @@ def delete_all_players(
         .filter(models.Player.agent_id == current_agent.id)
         .delete(synchronize_session=False)
     )
+    bump_players_version(db, current_agent.id)
     db.commit()
     return
 
@@ -444,10 +739,9 @@ def delete_all_players(
 def player_state_by_id(
     event_id: int = ParamPath(...),
     player_id: int = ParamPath(...),
-    db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    db: Session = Depends(get_read_db),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event_or_404(db, event_id, current_agent.id)
     p = (
         db.query(models.Player)
         .filter(models.Player.id == player_id, models.Player.agent_id == current_agent.id)
@@ -460,28 +754,57 @@ def player_state_by_id(
 @router.get("/state/by-phone/{event_id}/{phone_number}", response_model=schemas.PlayerStateOut)
 def player_state_by_phone(
     event_id: int = ParamPath(...),
-    player_id: int = ParamPath(...),
-    db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    phone_number: str = ParamPath(...),
+    db: Session = Depends(get_read_db),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event_or_404(db, event_id, current_agent.id)
-    p = (
-        db.query(models.Player)
-        .filter(
-            models.Player.phone_number == phone_number,
-            models.Player.agent_id == current_agent.id,
-        )
-        .first()
-    )
+    p = _get_player_by_phone(db, phone_number, current_agent.id)
     if not p:
         raise HTTPException(status_code=404, detail="Player not found")
     return _player_state_payload(db, event_id, p)
 
 
-
+@event_router.get("/state", response_model=List[schemas.PlayerStateOut])
+def event_player_states(
+    request: Request,
+    response: Response,
+    event_id: int = ParamPath(...),
+    db: Session = Depends(get_read_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    """State of every player registered for the event, in one query (kiosk "where do I play?")."""
+    event = owned_event(db, event_id)
+    # Assignments and registrations bump the event version; renames bump the players version.
+    etag = players_etag(current_agent.id, _players_version(db, current_agent), event.id, event.state_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return [_state_row(*row) for row in db.execute(_player_states_query(event_id))]
 
 
 #------------Helper Functions----------------
+def _get_player_by_phone(db: Session, phone_number: Optional[str], agent_id: int) -> Optional[models.Player]:
+    """Look a player up by any spelling of their number, via the E.164 index."""
+    phone_e164 = to_e164(phone_number)
+    if phone_e164 is None:
+        return None
+    return (
+        db.query(models.Player)
+        .filter(models.Player.phone_e164 == phone_e164, models.Player.agent_id == agent_id)
+        .first()
+    )
+
+def _require_e164(phone_number: str) -> str:
+    phone_e164 = to_e164(phone_number)
+    if phone_e164 is None:
+        raise HTTPException(status_code=400, detail=f"'{phone_number}' is not a valid phone number")
+    return phone_e164
+
+def _players_version(db: Session, agent: models.Agent) -> int:
+    # From the session serving the rows, which may be a replica behind the
+    # agent's own session, so the ETag never runs ahead of the data.
+    return db.get(models.Agent, agent.id).players_version
+
 def _get_event_or_404(db: Session, event_id: int, agent_id: int) -> models.Event:
     ev = (
         db.query(models.Event)
@@ -492,46 +815,61 @@ def _get_event_or_404(db: Session, event_id: int, agent_id: int) -> models.Event
         raise HTTPException(status_code=404, detail="Event not found")
     return ev
 
-def _player_state_payload(
-    db: Session, event_id: int, player: models.Player
-) -> schemas.PlayerStateOut:
-    # Find an ACTIVE assignment involving this player in this event
-    a = (
-        db.query(models.Assignment)
-        .filter(
-            models.Assignment.event_id == event_id,
-            models.Assignment.status == "active",
-            or_(
-                models.Assignment.player1_id == player.id,
-                models.Assignment.player2_id == player.id,
+def _player_states_query(event_id: int, player_id: Optional[int] = None):
+    """Players with their active match in the event, its table and opponent.
+
+    player LEFT JOIN active assignment LEFT JOIN table / opponent: one
+    statement whatever the number of players. Without ``player_id`` it
+    covers the players registered for the event; with it, that one player,
+    registered or not. app.scheduler.lock_players keeps a player in at most
+    one active match, so each player yields one row.
+    """
+    player = aliased(models.Player, name="player")
+    opponent = aliased(models.Player, name="opponent")
+    a = models.Assignment
+    stmt = (
+        select(player, a, models.Table.position, opponent)
+        .outerjoin(
+            a,
+            and_(
+                a.event_id == event_id,
+                a.status == "active",
+                or_(a.player1_id == player.id, a.player2_id == player.id),
             ),
         )
-        .first()
-    )
-    if not a:
-        return schemas.PlayerStateOut(
-            player=player,
-            state="free",
-            assignment_id=None,
-            table_id=None,
-            table_position=None,
-            opponent=None,
+        .outerjoin(models.Table, models.Table.id == a.table_id)
+        .outerjoin(
+            opponent,
+            opponent.id == case((a.player1_id == player.id, a.player2_id), else_=a.player1_id),
         )
+        .order_by(player.full_name, player.id)
+    )
+    if player_id is not None:
+        return stmt.where(player.id == player_id)
+    return stmt.join(models.Registration, models.Registration.player_id == player.id).where(
+        models.Registration.event_id == event_id
+    )
 
-    # Get table label if available
-    table = None
-    if a.table_id:
-        table = db.query(models.Table).filter(models.Table.id == a.table_id).first()
-
-    # Determine opponent
-    opponent_id = a.player2_id if a.player1_id == player.id else a.player1_id
-    opponent = db.query(models.Player).filter(models.Player.id == opponent_id).first()
 
+def _state_row(
+    player: models.Player,
+    a: Optional[models.Assignment],
+    table_position: Optional[int],
+    opponent: Optional[models.Player],
+) -> schemas.PlayerStateOut:
+    if a is None:
+        return schemas.PlayerStateOut(player=player, state="free")
     return schemas.PlayerStateOut(
         player=player,
         state="playing",
         assignment_id=a.id,
         table_id=a.table_id,
-        table_position=table.position if table else None,
+        table_position=table_position,
         opponent=opponent,
-    )
\ No newline at end of file
+    )
+
+
+def _player_state_payload(
+    db: Session, event_id: int, player: models.Player
+) -> schemas.PlayerStateOut:
+    return _state_row(*db.execute(_player_states_query(event_id, player.id)).first())
@@ -0,0 +1,96 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..board import record_board_change
+from ..db import get_db
+from .. import models, schemas
+from ..scheduler import fill_free_tables
+from ..security import get_event_agent
+from .assignments import _ensure_registered, _get_player_by_id_or_phone
+
+router = APIRouter(prefix="/events/{event_id}/queue", tags=["queue"])
+
+
+@router.get("", response_model=List[schemas.QueuedMatchOut])
+def list_queue(
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    return (
+        db.query(models.QueuedMatch)
+        .filter(models.QueuedMatch.event_id == event_id, models.QueuedMatch.status == "waiting")
+        .order_by(models.QueuedMatch.id)
+        .all()
+    )
+
+
+@router.post("", response_model=schemas.QueuedMatchOut, status_code=201)
+def enqueue_match(
+    payload: schemas.QueuedMatchCreate,
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    """Queue a pairing; it is seated right away if a table is free."""
+
+    p1 = _get_player_by_id_or_phone(db, payload.player1_id, payload.player1_phone, current_agent.id)
+    p2 = _get_player_by_id_or_phone(db, payload.player2_id, payload.player2_phone, current_agent.id)
+    if p1.id == p2.id:
+        raise HTTPException(status_code=400, detail="Choose two different players")
+    _ensure_registered(db, event_id, p1.id, p2.id)
+
+    queued = db.query(models.QueuedMatch.id).filter(
+        models.QueuedMatch.event_id == event_id,
+        models.QueuedMatch.status == "waiting",
+        or_(
+            models.QueuedMatch.player1_id.in_([p1.id, p2.id]),
+            models.QueuedMatch.player2_id.in_([p1.id, p2.id]),
+        ),
+    ).first()
+    if queued:
+        raise HTTPException(status_code=409, detail="One of the players is already waiting in the queue")
+
+    entry = models.QueuedMatch(
+        event_id=event_id,
+        player1_id=p1.id,
+        player2_id=p2.id,
+        notify=payload.notify,
+        status="waiting",
+    )
+    db.add(entry)
+    db.flush()
+
+    filled = fill_free_tables(db, event_id)
+    if filled:
+        record_board_change(db, event_id, [t.id for t in filled])
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+@router.delete("/{entry_id}", status_code=204)
+def cancel_queued_match(
+    entry_id: int,
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    entry = (
+        db.query(models.QueuedMatch)
+        .filter(
+            models.QueuedMatch.id == entry_id,
+            models.QueuedMatch.event_id == event_id,
+            models.QueuedMatch.status == "waiting",
+        )
+        .with_for_update()
+        .first()
+    )
+    if not entry:
+        raise HTTPException(status_code=404, detail="Queued match not found")
+    entry.status = "cancelled"
+    db.commit()
+    return None
@@ -1,37 +1,56 @@
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Sequence, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Path, Query, Response, UploadFile
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, contains_eager
 
 from ..db import get_db
+from ..replicas import get_read_db
 from .. import models, schemas
-from ..security import get_current_agent
+from ..pagination import MAX_PAGE_SIZE, contains_pattern, paginate
+from ..phones import to_e164
+from ..security import get_event_agent
+from ..versioning import bump_event_version
+from .players import _detect_file_format, _parse_player_rows, _upload_is_empty
 
-router = APIRouter(prefix="/events/{event_id}/registrations", tags=["registrations"])
+MAX_BULK_REGISTRATIONS = 5000
+BULK_INSERT_BATCH_SIZE = 1000
 
-def _get_event_or_404(event_id: int, db: Session, agent_id: int) -> models.Event:
-    event = (
-        db.query(models.Event)
-        .filter(models.Event.id == event_id, models.Event.agent_id == agent_id)
-        .first()
-    )
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return event
+router = APIRouter(prefix="/events/{event_id}/registrations", tags=["registrations"])
 
-@router.get("", response_model=List[schemas.RegistrationOut])
+@router.get("", response_model=Union[List[schemas.RegistrationOut], List[schemas.RegistrationSlimOut]])
 def list_registrations(
+    response: Response,
     event_id: int = Path(...),
-    db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    name: Optional[str] = Query(None, min_length=1),
+    view: Literal["full", "slim"] = "full",
+    db: Session = Depends(get_read_db),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event_or_404(event_id, db, current_agent.id)
-    return (
-        db.query(models.Registration)
-        .filter(models.Registration.event_id == event_id)
-        .order_by(models.Registration.created_at.desc())
-        .all()
-    )
+    """List registrations with their players, loaded in the same query.
+
+    ``view=slim`` selects only the columns the registration list shows.
+    """
+    if view == "slim":
+        query = db.query(
+            models.Registration.id,
+            models.Registration.player_id,
+            models.Registration.created_at,
+            models.Player.full_name,
+            models.Player.phone_number,
+        )
+    else:
+        query = db.query(models.Registration).options(contains_eager(models.Registration.player))
+    query = query.join(models.Registration.player).filter(models.Registration.event_id == event_id)
+    if name:
+        query = query.filter(models.Player.full_name.ilike(contains_pattern(name), escape="\\"))
+    rows = paginate(query, models.Registration, response, limit, cursor)
+    if view == "slim":
+        return [schemas.RegistrationSlimOut.model_validate(row._mapping) for row in rows]
+    return rows
 
 
 
@@ -40,11 +59,11 @@ def add_registration(
     payload: schemas.RegistrationCreate,
     event_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event_or_404(event_id, db, current_agent.id)
 
     player: Optional[models.Player] = None
+    phone_e164 = to_e164(payload.phone_number)
     if payload.player_id is not None:
         player = (
             db.query(models.Player)
@@ -54,11 +73,11 @@ def add_registration(
             )
             .first()
         )
-    elif payload.phone_number:
+    elif phone_e164:
         player = (
             db.query(models.Player)
             .filter(
-                models.Player.phone_number == payload.phone_number,
+                models.Player.phone_e164 == phone_e164,
                 models.Player.agent_id == current_agent.id,
             )
             .first()
@@ -86,20 +105,105 @@ def add_registration(
         player_id=player.id,
     )
     db.add(reg)
+    bump_event_version(db, event_id)
     db.commit()
     db.refresh(reg)
     return reg
 
     s
 
+def _register_players(
+    db: Session, event_id: int, agent_id: int, player_ids: Sequence[int], phone_numbers: Sequence[str]
+) -> schemas.BulkRegistrationResult:
+    """Resolve ids/phones with one IN query and register them with ON CONFLICT DO NOTHING."""
+    wanted_ids = set(player_ids)
+    e164_by_raw = {raw: to_e164(raw) for raw in phone_numbers}
+    wanted_phones = {e164 for e164 in e164_by_raw.values() if e164}
+
+    found: Dict[int, Optional[str]] = {}
+    if wanted_ids or wanted_phones:
+        found = dict(
+            db.query(models.Player.id, models.Player.phone_e164).filter(
+                models.Player.agent_id == agent_id,
+                or_(models.Player.id.in_(wanted_ids), models.Player.phone_e164.in_(wanted_phones)),
+            )
+        )
+    found_phones = {e164 for e164 in found.values() if e164}
+    not_found = [str(pid) for pid in sorted(wanted_ids - found.keys())]
+    not_found += [raw for raw, e164 in e164_by_raw.items() if e164 not in found_phones]
+
+    # A player named both by id and by phone is registered (and counted) once.
+    resolved = sorted(found)
+    created = 0
+    for start in range(0, len(resolved), BULK_INSERT_BATCH_SIZE):
+        chunk = resolved[start : start + BULK_INSERT_BATCH_SIZE]
+        created += len(
+            db.execute(
+                insert(models.Registration)
+                .values([{"event_id": event_id, "player_id": pid} for pid in chunk])
+                .on_conflict_do_nothing(index_elements=[models.Registration.event_id, models.Registration.player_id])
+                .returning(models.Registration.id)
+            ).all()
+        )
+    if created:
+        bump_event_version(db, event_id)
+    db.commit()
+
+    return schemas.BulkRegistrationResult(
+        requested=len(resolved) + len(not_found),
+        created=created,
+        duplicate=len(resolved) - created,
+        not_found=len(not_found),
+        not_found_items=not_found,
+    )
+
+
+@router.post("/bulk", response_model=schemas.BulkRegistrationResult)
+def add_registrations_bulk(
+    payload: schemas.RegistrationBulkCreate,
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    return _register_players(db, event_id, current_agent.id, payload.player_ids, payload.phone_numbers)
+
+
+@router.post("/bulk/upload", response_model=schemas.BulkRegistrationResult)
+def add_registrations_from_file(
+    file: UploadFile = File(...),
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    """Register the players listed in a CSV/XLSX roster, matched by phone number.
+
+    Same formats as the player import; a file with a single column of
+    numbers works too.
+    """
+    if _upload_is_empty(file):
+        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+
+    phone_numbers: List[str] = []
+    for _, full_name, phone_number in _parse_player_rows(file.file, _detect_file_format(file)):
+        phone = phone_number or (full_name if to_e164(full_name) else None)
+        if phone:
+            phone_numbers.append(phone)
+        if len(phone_numbers) > MAX_BULK_REGISTRATIONS:
+            raise HTTPException(
+                status_code=400, detail=f"At most {MAX_BULK_REGISTRATIONS} players can be registered at once."
+            )
+    if not phone_numbers:
+        raise HTTPException(status_code=400, detail="No phone numbers found in the uploaded file.")
+    return _register_players(db, event_id, current_agent.id, [], list(dict.fromkeys(phone_numbers)))
+
+
 @router.delete("/{registration_id}", status_code=204)
 def remove_registration(
     registration_id: int,
     event_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _get_event_or_404(event_id, db, current_agent.id)
     reg = (
         db.query(models.Registration)
         .filter(
@@ -111,5 +215,6 @@ def remove_registration(
     if not reg:
         raise HTTPException(status_code=404, detail="Registration not found")
     db.delete(reg)
+    bump_event_version(db, event_id)
     db.commit()
     return None
\ No newline at end of file
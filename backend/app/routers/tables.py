@@ -1,32 +1,49 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
+from .. import board_stream
+from ..board import board_changes_since, board_query, board_row, board_rows, record_board_change
+from ..config import settings
 from ..db import get_db
+from ..replicas import get_async_read_db, get_read_db
 from .. import models, schemas
-from ..security import get_current_agent
+from ..scheduler import fill_table
+from ..security import (
+    get_event_agent,
+    get_event_agent_async,
+    get_stream_agent_id,
+    issue_stream_ticket,
+    owned_event,
+    owned_event_async,
+)
+from ..versioning import etag_matches, event_etag, not_modified, set_etag
 
 router = APIRouter(prefix="/events/{event_id}/tables", tags=["tables"])
 
 
-def _event_exists(db: Session, event_id: int, agent_id: int):
+def _event_exists(db: Session, event_id: int, agent_id: int) -> int:
+    """Check event ownership and return the event's current state version."""
     exists = (
-        db.query(models.Event.id)
+        db.query(models.Event.state_version)
         .filter(models.Event.id == event_id, models.Event.agent_id == agent_id)
         .first()
     )
     if not exists:
         raise HTTPException(status_code=404, detail="Event not found")
+    return exists.state_version
 
 
 @router.get("", response_model=List[schemas.TableOut])
 def list_tables(
     event_id: int = Path(...),
-    db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    db: Session = Depends(get_read_db),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _event_exists(db, event_id, current_agent.id)
     return db.query(models.Table).filter(models.Table.event_id == event_id).order_by(models.Table.id).all()
 
 
@@ -35,9 +52,8 @@ def create_table_at_position(
     event_id: int = Path(...),
     position:int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _event_exists(db, event_id, current_agent.id)
     exist= (
         db.query(models.Table.id)
         .filter(models.Table.event_id == event_id, models.Table.position == position)
@@ -48,6 +64,7 @@ def create_table_at_position(
     
     t = models.Table(event_id=event_id,position=position ,status="free")
     db.add(t)
+    record_board_change(db, event_id)
     db.commit()
     db.refresh(t)
     return t
@@ -57,14 +74,9 @@ def seed_tables(
     payload: schemas.TableSeed,
     event_id : int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _event_exists(db,event_id, current_agent.id)
-    event= (
-        db.query(models.Event)
-        .filter(models.Event.id == event_id, models.Event.agent_id == current_agent.id)
-        .first()
-    )
+    event = owned_event(db, event_id)
     target= payload.count if payload.count is not None else event.tables_count  # use event.tables_count if not provided
     if target <= 0:
         raise HTTPException(status_code=400, detail="Target table count must be positive")
@@ -92,6 +104,7 @@ def seed_tables(
         db.add(t)
         created.append(t)
 
+    record_board_change(db, event_id)
     db.commit()
 
     return (
@@ -110,11 +123,10 @@ def set_table_status(
     table_id: int = Path(...),
     status : str = Path(..., pattern="^(free|occupied)$"),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _event_exists(db, event_id, current_agent.id)
     t = db.query(models.Table).filter(
-        and_(models.Table.id == table_id, models.Table.event_id == event_id)).first()
+        and_(models.Table.id == table_id, models.Table.event_id == event_id)).with_for_update().first()
     if not t:
         raise HTTPException(status_code=404, detail="Table not found")
     if status == "free":
@@ -125,11 +137,12 @@ def set_table_status(
                 a.status = "finished"
         t.current_assignment_id = None
         t.status = "free"
+        fill_table(db, event_id, t)
     else:  # "occupied"
         t.status = "occupied"
         # note: we don't create/attach an assignment here; purely status flip
 
-    
+    record_board_change(db, event_id, [t.id])
     db.commit()
     db.refresh(t)
     return t
@@ -143,11 +156,10 @@ def set_table_status(
     position: int = Path(...),
     status : str = Path(..., pattern="^(free|occupied)$"),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _event_exists(db, event_id, current_agent.id)
     t = db.query(models.Table).filter(
-        and_(models.Table.position == position, models.Table.event_id == event_id)).first()
+        and_(models.Table.position == position, models.Table.event_id == event_id)).with_for_update().first()
     if not t:
         raise HTTPException(status_code=404, detail="Table not found")
     if status == "free":
@@ -158,9 +170,11 @@ def set_table_status(
                 a.status = "finished"
         t.current_assignment_id = None
         t.status = "free"
+        fill_table(db, event_id, t)
     else:  # "occupied"
         t.status = "occupied"
         # note: we don't create/attach an assignment here; purely status flip
+    record_board_change(db, event_id, [t.id])
     db.commit()
     db.refresh(t)
     return t
@@ -168,44 +182,77 @@ def set_table_status(
 
 
 @router.get("/board", response_model=List[schemas.TableBoardRow])
-def board(
+async def board(
+    request: Request,
+    response: Response,
+    event_id: int = Path(...),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_agent: models.Agent = Depends(get_event_agent_async),
+):
+    version = (await owned_event_async(db, event_id)).state_version
+    etag = event_etag(event_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    result = await db.execute(board_query(event_id))
+    return [board_row(t, a, p1, p2) for t, a, p1, p2 in result]
+
+
+@router.get("/changes", response_model=schemas.TableChangesOut)
+def table_changes(
+    since: int = Query(..., ge=0),
+    event_id: int = Path(...),
+    db: Session = Depends(get_read_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    """Tables whose state changed after version ``since`` (the last seen ``version``)."""
+    ev = owned_event(db, event_id)
+    return board_changes_since(db, event_id, since, ev.state_version, ev.changes_floor)
+
+
+def _board_snapshot(db: Session, event_id: int, agent_id: int):
+    version = _event_exists(db, event_id, agent_id)
+    return version, board_rows(db, event_id)
+
+
+@router.post("/board/stream-ticket", response_model=schemas.StreamTicketOut)
+def board_stream_ticket(
+    event_id: int = Path(...),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
+    """A short-lived ``?ticket=`` for :func:`stream_board`, which cannot take a bearer header."""
+    return schemas.StreamTicketOut(
+        ticket=issue_stream_ticket(current_agent.id, event_id),
+        expires_in=settings.BOARD_STREAM_TICKET_SECONDS,
+    )
+
+
+@router.get("/board/stream")
+async def stream_board(
     event_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    agent_id: int = Depends(get_stream_agent_id),
 ):
-    _event_exists(db, event_id, current_agent.id)
-    rows: list[schemas.TableBoardRow] = []
-    tables = db.query(models.Table).filter(models.Table.event_id == event_id).order_by(models.Table.id).all()
-    for t in tables:
-        p1 = p2 = None
-        assignment_status = None
-        started_at = notified_at = ended_at = created_at = None
-        if t.current_assignment_id:
-            a = db.query(models.Assignment).filter(models.Assignment.id == t.current_assignment_id).first()
-            if a and a.status == "active":
-                p1, p2 = a.player1, a.player2
-                assignment_status = a.status
-                started_at = a.started_at
-                notified_at = a.notified_at
-                ended_at = a.ended_at
-                created_at = a.created_at
-        rows.append(
-            schemas.TableBoardRow(
-                id=t.id,
-                position=t.position,
-                status=t.status,
-                label=f"Table {t.position}" if t.position is not None else f"Table {t.id}",
-                current_assignment_id=t.current_assignment_id,
-                assignment_status=assignment_status,
-                assignment_created_at=created_at,
-                started_at=started_at,
-                notified_at=notified_at,
-                ended_at=ended_at,
-                player1=p1,
-                player2=p2,
-            )
-        )
-    return rows
+    """Server-Sent Events: one ``snapshot``, then ``delta`` / ``resync`` events.
+
+    Authenticated by a ``?ticket=`` from ``POST .../board/stream-ticket``.
+    """
+    # Subscribe before reading the snapshot so nothing committed in between is missed.
+    queue = board_stream.subscribe(event_id)
+    try:
+        version, snapshot = await run_in_threadpool(_board_snapshot, db, event_id, agent_id)
+    except Exception:
+        board_stream.unsubscribe(event_id, queue)
+        raise
+    finally:
+        # get_db would close it only when the stream ends, keeping a pooled
+        # connection idle in transaction for as long as the screen is open.
+        await run_in_threadpool(db.close)
+    return StreamingResponse(
+        board_stream.stream(event_id, queue, version, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 #---------DELETE-----------------
@@ -214,9 +261,8 @@ def delete_table(
     event_id: int = Path(...),
     table_id: int = Path(...),
     db: Session = Depends(get_db),
-    current_agent: models.Agent = Depends(get_current_agent),
+    current_agent: models.Agent = Depends(get_event_agent),
 ):
-    _event_exists(db, event_id, current_agent.id)
     t = (
         db.query(models.Table)
         .filter(and_(models.Table.id == table_id, models.Table.event_id == event_id))
@@ -227,27 +273,37 @@ def delete_table(
     if t.current_assignment_id:
         raise HTTPException(status_code=400, detail="Cannot delete a table with an active assignment")
     db.delete(t)
+    record_board_change(db, event_id)
     db.commit()
     return None
 
 
 
 @router.delete("/pos/{position}", status_code=204)
-def delete_table_by_position(event_id: int = Path(...), position: int = Path(...), db: Session = Depends(get_db)):
-    _event_exists(db, event_id)
+def delete_table_by_position(
+    event_id: int = Path(...),
+    position: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
     t = db.query(models.Table).filter(and_(models.Table.position == position, models.Table.event_id == event_id)).first()
     if not t:
         raise HTTPException(status_code=404, detail="Table not found")
     if t.current_assignment_id:
         raise HTTPException(status_code=400, detail="Cannot delete a table with an active assignment")
     db.delete(t)
+    record_board_change(db, event_id)
     db.commit()
     return
 
 @router.delete("", status_code=204)
-def delete_all_tables(event_id: int = Path(...), db: Session = Depends(get_db)):
-    _event_exists(db, event_id)
+def delete_all_tables(
+    event_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_agent: models.Agent = Depends(get_event_agent),
+):
     db.query(models.Table).filter(models.Table.event_id == event_id).delete(synchronize_session=False)
+    record_board_change(db, event_id)
     db.commit()
     return
 
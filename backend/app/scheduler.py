@@ -0,0 +1,155 @@
+# backend/app/scheduler.py
+"""Assignment rules shared by the desk routes and the automatic match queue.
+
+When a table frees up, :func:`fill_table` pops the oldest waiting pair whose
+players are both registered and not already playing, and seats them in the
+same transaction. Queue rows are locked one at a time with ``FOR UPDATE SKIP
+LOCKED``, so two tables freeing at once never take the same pair, and each
+passes over only the row the other is looking at.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .notifications import NotificationError, enqueue_notifications
+
+logger = logging.getLogger(__name__)
+
+# How many waiting pairs to look at per free table before giving up.
+QUEUE_SCAN_LIMIT = 50
+
+
+def registered_player_ids(db: Session, event_id: int, player_ids: Iterable[int]) -> Set[int]:
+    """Return the subset of ``player_ids`` registered for the event."""
+    ids = set(player_ids)
+    if not ids:
+        return set()
+    return {
+        pid
+        for (pid,) in db.query(models.Registration.player_id).filter(
+            models.Registration.event_id == event_id,
+            models.Registration.player_id.in_(ids),
+        )
+    }
+
+
+def active_player_ids(db: Session, event_id: int, player_ids: Iterable[int]) -> Set[int]:
+    """Return the subset of ``player_ids`` currently playing in the event."""
+    ids = set(player_ids)
+    if not ids:
+        return set()
+    rows = db.query(models.Assignment.player1_id, models.Assignment.player2_id).filter(
+        models.Assignment.event_id == event_id,
+        models.Assignment.status == "active",
+        or_(models.Assignment.player1_id.in_(ids), models.Assignment.player2_id.in_(ids)),
+    )
+    return {pid for row in rows for pid in row} & ids
+
+
+def lock_players(db: Session, player_ids: Iterable[int]) -> None:
+    """Row-lock the players, in id order so concurrent desks cannot deadlock.
+
+    Held until commit, this makes the "already playing" check that follows
+    safe against another desk seating the same player at the same time.
+    """
+    ids = sorted(set(player_ids))
+    if ids:
+        db.query(models.Player.id).filter(models.Player.id.in_(ids)).order_by(models.Player.id).with_for_update().all()
+
+
+def start_assignment(db: Session, table: models.Table, player1_id: int, player2_id: int) -> models.Assignment:
+    """Create an active assignment and mark ``table`` occupied (flushes, no commit)."""
+    a = models.Assignment(
+        event_id=table.event_id,
+        table_id=table.id,
+        player1_id=player1_id,
+        player2_id=player2_id,
+        status="active",
+        notified_at=None,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(a)
+    db.flush()  # get a.id before commit
+
+    table.status = "occupied"
+    table.current_assignment_id = a.id
+    return a
+
+
+def fill_table(db: Session, event_id: int, table: models.Table) -> Optional[models.Assignment]:
+    """Seat the next eligible waiting pair at the free ``table``, if any.
+
+    Pairs with a player no longer registered can never be seated and are
+    cancelled; pairs with a player still at another table keep waiting.
+    """
+    if table.status != "free":
+        return None
+    db.flush()  # the caller's just-finished assignment must not count as active
+
+    passed: List[int] = []  # locked by us until commit, so not skipped by SKIP LOCKED
+    for _ in range(QUEUE_SCAN_LIMIT):
+        query = db.query(models.QueuedMatch).filter(
+            models.QueuedMatch.event_id == event_id, models.QueuedMatch.status == "waiting"
+        )
+        if passed:
+            query = query.filter(models.QueuedMatch.id.notin_(passed))
+        entry = query.order_by(models.QueuedMatch.id).limit(1).with_for_update(skip_locked=True).first()
+        if entry is None:
+            return None
+        passed.append(entry.id)
+
+        pair = {entry.player1_id, entry.player2_id}
+        if registered_player_ids(db, event_id, pair) != pair:
+            entry.status = "cancelled"
+            logger.info("queued match %s cancelled: a player left the event", entry.id)
+            continue
+        lock_players(db, pair)
+        if active_player_ids(db, event_id, pair):
+            continue
+
+        a = start_assignment(db, table, entry.player1_id, entry.player2_id)
+        entry.status = "assigned"
+        entry.assignment_id = a.id
+        entry.assigned_at = a.created_at
+        db.flush()
+
+        if entry.notify:
+            event = db.get(models.Event, event_id)
+            try:
+                enqueue_notifications(
+                    db,
+                    table,
+                    a,
+                    (entry.player1, entry.player2),
+                    (entry.player2, entry.player1),
+                    event.name,
+                )
+            except NotificationError as exc:
+                # No desk operator to report to; seat them anyway.
+                logger.warning("queued match %s assigned without SMS: %s", entry.id, exc)
+        return a
+    return None
+
+
+def fill_free_tables(db: Session, event_id: int) -> List[models.Table]:
+    """Seat waiting pairs at every free table of the event; return the tables filled."""
+    tables = (
+        db.query(models.Table)
+        .filter(models.Table.event_id == event_id, models.Table.status == "free")
+        .order_by(models.Table.position)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    filled: List[models.Table] = []
+    for table in tables:
+        if fill_table(db, event_id, table) is None:
+            break
+        filled.append(table)
+    return filled
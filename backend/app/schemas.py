@@ -1,4 +1,5 @@
 # backend/app/schemas.py
+import uuid
 from datetime import datetime
 from typing import Optional, List, Literal
 from pydantic import BaseModel, EmailStr, Field
@@ -26,7 +27,8 @@ class PlayerCreate(BaseModel):
 class PlayerOut(BaseModel):
     id: int
     full_name: str
-    phone_number: str
+    phone_number: Optional[str] = None
+    phone_e164: Optional[str] = None
     created_at: datetime
 
     model_config = {"from_attributes": True}  # pydantic v2
@@ -35,16 +37,22 @@ class PlayerOut(BaseModel):
 class PlayerSlim(BaseModel):
     id: int
     full_name: str
-    phone_number: str
+    phone_number: Optional[str] = None
     model_config = {"from_attributes": True}
 
 
+class PlayerSearchHit(BaseModel):
+    id: int
+    full_name: str
+    phone_number: Optional[str] = None
+
+
 class PlayerStateOut(BaseModel):
     player: PlayerSlim
     state: Literal["free", "playing"]
     assignment_id: Optional[int] = None
     table_id: Optional[int] = None
-    table_position: Optional[str] = None
+    table_position: Optional[int] = None
     opponent: Optional[PlayerSlim] = None
     model_config = {"from_attributes": True}
 
@@ -54,11 +62,47 @@ class BulkImportResult(BaseModel):
     skipped: int
     errors: List[str] = []
 
+class ImportJobOut(BaseModel):
+    id: uuid.UUID
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    filename: Optional[str] = None
+    total_rows: int
+    created: int
+    skipped: int
+    errors: List[str] = []  # capped; error_count has the total
+    error_count: int = 0
+    detail: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = {"from_attributes": True}
+
 class RegistrationCreate(BaseModel):
     player_id: Optional[int] = None
     phone_number: Optional[str] = None
 
 
+class RegistrationSlimOut(BaseModel):
+    id: int
+    player_id: int
+    full_name: str
+    phone_number: Optional[str] = None
+    created_at: datetime
+
+
+class RegistrationBulkCreate(BaseModel):
+    player_ids: List[int] = Field(default_factory=list, max_length=5000)
+    phone_numbers: List[str] = Field(default_factory=list, max_length=5000)
+
+
+class BulkRegistrationResult(BaseModel):
+    requested: int
+    created: int
+    duplicate: int  # already registered
+    not_found: int
+    not_found_items: List[str] = []  # the ids / numbers that matched no player
+
+
 class RegistrationOut(BaseModel):
     id: int
     event_id: int
@@ -115,6 +159,10 @@ class TableUpdate(BaseModel):
     status: Optional[str] = None
     position: Optional[int] = None
 
+class StreamTicketOut(BaseModel):
+    ticket: str
+    expires_in: int  # seconds
+
 # ---- Assignment ----
 class AssignmentCreate(BaseModel):
     # choose by ids or phones; ids take precedence
@@ -137,6 +185,52 @@ class AssignmentOut(BaseModel):
     player2: PlayerSlim
     model_config = {"from_attributes": True}
 
+# ---- Bulk assignment (round start) ----
+class BulkAssignmentItem(BaseModel):
+    table_id: int
+    # choose by ids or phones; ids take precedence
+    player1_id: Optional[int] = None
+    player2_id: Optional[int] = None
+    player1_phone: Optional[str] = None
+    player2_phone: Optional[str] = None
+
+class BulkAssignmentCreate(BaseModel):
+    items: List[BulkAssignmentItem] = Field(min_length=1, max_length=500)
+    notify: bool = True
+
+class BulkAssignmentItemResult(BaseModel):
+    index: int  # position in the request's items
+    table_id: int
+    status: Literal["created", "conflict"]
+    detail: Optional[str] = None
+    assignment: Optional[AssignmentOut] = None
+
+class BulkAssignmentResult(BaseModel):
+    created: int
+    conflicts: int
+    items: List[BulkAssignmentItemResult]
+
+# ---- Match queue ----
+class QueuedMatchCreate(BaseModel):
+    # choose by ids or phones; ids take precedence
+    player1_id: Optional[int] = None
+    player2_id: Optional[int] = None
+    player1_phone: Optional[str] = None
+    player2_phone: Optional[str] = None
+    notify: bool = True
+
+class QueuedMatchOut(BaseModel):
+    id: int
+    event_id: int
+    status: str
+    notify: bool
+    assignment_id: Optional[int] = None
+    created_at: datetime
+    assigned_at: Optional[datetime] = None
+    player1: PlayerSlim
+    player2: PlayerSlim
+    model_config = {"from_attributes": True}
+
 class AssignmentMove(BaseModel):
     new_table_id: int
 
@@ -157,4 +251,11 @@ class TableBoardRow(BaseModel):
     notified_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
     player1: Optional[PlayerSlim] = None
-    player2: Optional[PlayerSlim] = None
\ No newline at end of file
+    player2: Optional[PlayerSlim] = None
+
+
+class TableChangesOut(BaseModel):
+    version: int
+    full: bool  # true: `tables` is the whole board and replaces the client's copy
+    tables: List[TableBoardRow] = []
+    removed: List[int] = []  # table ids that no longer exist
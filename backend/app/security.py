@@ -1,12 +1,22 @@
 """Security helpers for authentication and authorization."""
 
-from fastapi import Depends, HTTPException, status
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Path, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from . import models
-from .db import get_db
+from . import models, pubsub
+from .config import settings
+from .db import get_async_db, get_db
 
 pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -33,11 +43,271 @@ def get_current_agent(
     if not credentials or credentials.scheme.lower() != "bearer":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    token = credentials.credentials
+    return _agent_for_token(db, credentials.credentials)
+
+
+def get_event_agent(
+    event_id: int = Path(...),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> models.Agent:
+    """Like :func:`get_current_agent`, and also 404 unless the agent owns ``event_id``.
+
+    On a cold cache the token lookup and the ownership check are one
+    statement, which also puts the Event in the session, so a following
+    ``db.get(models.Event, event_id)`` is free. Warm, it costs no query.
+    """
+
+    if not credentials or credentials.scheme.lower() != "bearer":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    return _event_agent_for_token(db, credentials.credentials, event_id)
+
+
+def owned_event(db: Session, event_id: int) -> models.Event:
+    """The event a :func:`get_event_agent` route operates on (free after a cold check)."""
+
+    event = db.get(models.Event, event_id)
+    if event is None:  # deleted while its ownership was cached
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
+# ---- board stream tickets ----
+# Browsers' EventSource cannot send an Authorization header, and an API token
+# in the query string would end up in access and proxy logs. Clients trade
+# their token for a ticket valid for one event and BOARD_STREAM_TICKET_SECONDS,
+# and put that in the stream URL instead. Tickets are signed, not stored.
+
+def issue_stream_ticket(agent_id: int, event_id: int) -> str:
+    expires_at = int(time.time()) + settings.BOARD_STREAM_TICKET_SECONDS
+    payload = f"{agent_id}.{event_id}.{expires_at}"
+    return f"{payload}.{_ticket_signature(payload)}"
+
+
+def get_stream_agent_id(event_id: int = Path(...), ticket: str = Query(...)) -> int:
+    """The agent a valid ticket for ``event_id`` was issued to; no query."""
+
+    try:
+        agent_id, ticket_event_id, expires_at, signature = ticket.split(".")
+        valid = (
+            hmac.compare_digest(signature, _ticket_signature(f"{agent_id}.{ticket_event_id}.{expires_at}"))
+            and int(ticket_event_id) == event_id
+            and int(expires_at) >= time.time()
+        )
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired stream ticket")
+    return int(agent_id)
+
+
+def _ticket_signature(payload: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"board-stream:{payload}".encode(), hashlib.sha256).hexdigest()
+
+
+# ---- AsyncSession variants, for routes ported to app.db.get_async_db ----
+# Same cache and statements, run on the session's sync facade. Expired columns
+# of the returned agent (players_version) cannot lazy-load outside run_sync.
+
+async def get_current_agent_async(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.Agent:
+    if not credentials or credentials.scheme.lower() != "bearer":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    return await db.run_sync(_agent_for_token, credentials.credentials)
+
+
+async def get_event_agent_async(
+    event_id: int = Path(...),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.Agent:
+    if not credentials or credentials.scheme.lower() != "bearer":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    return await db.run_sync(_event_agent_for_token, credentials.credentials, event_id)
+
+
+async def owned_event_async(db: AsyncSession, event_id: int) -> models.Event:
+    event = await db.get(models.Event, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
+def _agent_for_token(db: Session, token: str) -> models.Agent:
+    key = _token_key(token)
+    db.info[SESSION_TOKEN_KEY] = key
+    cached = _cached_identity(key)
+    if cached is not None:
+        return _attach_identity(db, cached)
+
     agent = db.query(models.Agent).filter(models.Agent.api_token == token).first()
 
     if not agent:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
 
+    _remember_identity(key, {column: getattr(agent, column) for column in _CACHED_COLUMNS})
     return agent
 
+
+def _event_agent_for_token(db: Session, token: str, event_id: int) -> models.Agent:
+    key = _token_key(token)
+    db.info[SESSION_TOKEN_KEY] = key
+    cached = _cached_identity(key)
+    if cached is not None:
+        agent = _attach_identity(db, cached)
+        if not _owns_event(agent.id, event_id):
+            owned = (
+                db.query(models.Event.id)
+                .filter(models.Event.id == event_id, models.Event.agent_id == agent.id)
+                .first()
+            )
+            if not owned:
+                raise HTTPException(status_code=404, detail="Event not found")
+            _remember_ownership(agent.id, event_id)
+        return agent
+
+    row = db.execute(
+        select(models.Agent, models.Event)
+        .outerjoin(models.Event, and_(models.Event.id == event_id, models.Event.agent_id == models.Agent.id))
+        .where(models.Agent.api_token == token)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+
+    agent, event = row
+    _remember_identity(key, {column: getattr(agent, column) for column in _CACHED_COLUMNS})
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    _remember_ownership(agent.id, event_id)
+    return agent
+
+
+# ---- token -> agent cache ----
+# Polling screens authenticate several times a second; the token lookup was the
+# most executed query. Entries expire after AUTH_CACHE_TTL_SECONDS and are
+# dropped on every worker when login rotates the token (AUTH_CHANNEL).
+
+AUTH_CHANNEL = "auth_tokens"
+# session.info key for the digest of the token that authenticated the request
+# (app.replicas keeps that client on the primary after it commits).
+SESSION_TOKEN_KEY = "token_key"
+_CACHED_COLUMNS = ("id", "full_name", "email", "api_token", "created_at")
+
+_token_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _attach_identity(db: Session, identity: Dict[str, Any]) -> models.Agent:
+    # Attach the cached identity to the request session without a query.
+    # Columns left out (players_version, password_hash) are expired and load
+    # from this same session if a route reads them.
+    agent = models.Agent(**identity)
+    make_transient_to_detached(agent)
+    db.add(agent)
+    return agent
+
+
+def _token_key(token: str) -> str:
+    # Keys (and invalidation messages) carry a digest, never the token itself.
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cached_identity(key: str) -> Optional[Dict[str, Any]]:
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, identity = entry
+        if expires_at < time.monotonic():
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return identity
+
+
+def _remember_identity(key: str, identity: Dict[str, Any]) -> None:
+    if settings.AUTH_CACHE_TTL_SECONDS <= 0:
+        return
+    with _token_cache_lock:
+        _token_cache[key] = (time.monotonic() + settings.AUTH_CACHE_TTL_SECONDS, identity)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > settings.AUTH_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def _forget(key: str) -> None:
+    with _token_cache_lock:
+        _token_cache.pop(key, None)
+
+
+def invalidate_token(db: Session, token: Optional[str]) -> None:
+    """Stop accepting ``token`` here now, and on other workers once ``db`` commits."""
+
+    if not token:
+        return
+    key = _token_key(token)
+    _forget(key)
+    pubsub.notify(db, AUTH_CHANNEL, key)
+
+
+# ---- (agent, event) ownership cache ----
+# Ownership only changes when an event is deleted, which drops the entries on
+# every worker (EVENT_ACCESS_CHANNEL). Routes on a deleted event also fail on
+# their own queries, so a short TTL covers missed messages.
+
+EVENT_ACCESS_CHANNEL = "event_access"
+
+_owned_events: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+
+
+def _owns_event(agent_id: int, event_id: int) -> bool:
+    with _token_cache_lock:
+        expires_at = _owned_events.get((agent_id, event_id))
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del _owned_events[(agent_id, event_id)]
+            return False
+        _owned_events.move_to_end((agent_id, event_id))
+        return True
+
+
+def _remember_ownership(agent_id: int, event_id: int) -> None:
+    if settings.EVENT_ACCESS_CACHE_SECONDS <= 0:
+        return
+    with _token_cache_lock:
+        _owned_events[(agent_id, event_id)] = time.monotonic() + settings.EVENT_ACCESS_CACHE_SECONDS
+        _owned_events.move_to_end((agent_id, event_id))
+        while len(_owned_events) > settings.AUTH_CACHE_SIZE:
+            _owned_events.popitem(last=False)
+
+
+def _forget_event(event_id: int) -> None:
+    with _token_cache_lock:
+        for key in [key for key in _owned_events if key[1] == event_id]:
+            del _owned_events[key]
+
+
+def forget_event(db: Session, event_id: int) -> None:
+    """Drop cached ownership of ``event_id`` here now, and on other workers once ``db`` commits."""
+
+    _forget_event(event_id)
+    pubsub.notify(db, EVENT_ACCESS_CHANNEL, str(event_id))
+
+
+def _forget_all() -> None:
+    with _token_cache_lock:
+        _token_cache.clear()
+        _owned_events.clear()
+
+
+pubsub.subscribe(AUTH_CHANNEL, _forget)
+pubsub.subscribe(EVENT_ACCESS_CHANNEL, lambda payload: _forget_event(int(payload)))
+# Invalidations may have been missed while the listener was down.
+pubsub.on_reconnect(_forget_all)
+
@@ -11,11 +11,18 @@ class TwilioSettings(BaseSettings):
     TWILIO_MESSAGING_SERVICE_SID: str | None = None  # preferred after upgrade
     TWILIO_FROM_NUMBER: str | None = None  # trial: your Twilio number in E.164
     BASE_URL: str = "http://localhost:8000"
+    # Only enable once BASE_URL is reachable from Twilio; callbacks land on /twilio/status.
+    TWILIO_STATUS_CALLBACK_ENABLED: bool = False
 
     # Let it read a .env file when running locally; Docker will still pass env vars.
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
+def status_callback_url(cfg: TwilioSettings) -> str:
+    """Where Twilio posts delivery updates; the URL its request signatures cover."""
+    return f"{cfg.BASE_URL.rstrip('/')}/twilio/status"
+
+
 _cached_settings: TwilioSettings | None = None
 
 
@@ -1,15 +1,130 @@
-from fastapi import APIRouter, Form
+import logging
+import threading
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Form, Header, HTTPException, Request
 from fastapi.responses import PlainTextResponse
+from twilio.request_validator import RequestValidator
+
+from .db import SessionLocal
+from .notifications import apply_status_updates
+from .twilio_conf import get_twilio_settings, status_callback_url
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/twilio", tags=["twilio"])
 
+FLUSH_SECONDS = 1.0
+FLUSH_BATCH_SIZE = 500
+
+# Later states win when several callbacks for one message share a batch;
+# Twilio does not guarantee callback order.
+_STATUS_RANK = {
+    "accepted": 0,
+    "queued": 0,
+    "sending": 1,
+    "sent": 2,
+    "delivered": 3,
+    "undelivered": 3,
+    "failed": 3,
+    "read": 4,
+}
+
+
+class StatusWriter:
+    """Buffer status callbacks and write them in batches.
+
+    A burst of callbacks at round start becomes a handful of multi-row
+    upserts instead of one transaction per callback.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, sid: str, status: str, to: Optional[str], error_code: Optional[str]) -> None:
+        with self._lock:
+            current = self._pending.get(sid)
+            if current and _STATUS_RANK.get(current["status"], 0) > _STATUS_RANK.get(status, 0):
+                return
+            self._pending[sid] = {
+                "message_sid": sid,
+                "status": status,
+                "to_number": to,
+                "error_code": error_code,
+            }
+            if len(self._pending) >= FLUSH_BATCH_SIZE:
+                self._wake.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            batch, self._pending = list(self._pending.values()), {}
+        if not batch:
+            return 0
+        try:
+            with SessionLocal() as db:
+                apply_status_updates(db, batch)
+                db.commit()
+        except Exception:
+            logger.exception("failed to store %d Twilio status callbacks", len(batch))
+            with self._lock:
+                # Put them back unless a newer callback arrived meanwhile.
+                for row in batch:
+                    self._pending.setdefault(row["message_sid"], row)
+        return len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(FLUSH_SECONDS)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="twilio-status", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+        self.flush()
+
+
+status_writer = StatusWriter()
+
+
+def signed_by_twilio(params: Dict[str, str], signature: Optional[str]) -> bool:
+    """Check ``X-Twilio-Signature`` against the callback URL we gave Twilio.
+
+    Twilio signs the URL it posted to, not the one this app sees behind the
+    proxy, so the configured ``BASE_URL`` is used. Unconfigured: refuse all.
+    """
+    cfg = get_twilio_settings()
+    if not signature or cfg is None or not cfg.TWILIO_AUTH_TOKEN:
+        return False
+    return RequestValidator(cfg.TWILIO_AUTH_TOKEN).validate(status_callback_url(cfg), params, signature)
+
+
 @router.post("/status", response_class=PlainTextResponse)
 async def status(
+    request: Request,
     MessageSid: str = Form(...),
     MessageStatus: str = Form(...),  # queued|sent|delivered|undelivered|failed
     To: str = Form(None),
     ErrorCode: str = Form(None),
+    x_twilio_signature: Optional[str] = Header(None),
 ):
-    # For now just log. Later: update notifications table.
-    print({"sid": MessageSid, "status": MessageStatus, "to": To, "error": ErrorCode})
+    form = await request.form()  # already parsed for the Form fields above
+    if not signed_by_twilio(dict(form), x_twilio_signature):
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+    status_writer.record(MessageSid, MessageStatus, To, ErrorCode)
     return "OK"
@@ -0,0 +1,72 @@
+# backend/app/versioning.py
+"""Per-event and per-agent state versions used for conditional GETs.
+
+Every mutation bumps a counter in the same transaction as the change, so a
+poller can be answered with a 304 by comparing its ETag against the counter
+alone, without rebuilding the payload.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from . import models
+
+
+def bump_event_version(db: Session, event_id: int) -> int:
+    """Increment the event's state version and return the new value."""
+
+    return db.execute(
+        update(models.Event)
+        .where(models.Event.id == event_id)
+        .values(state_version=models.Event.state_version + 1)
+        .returning(models.Event.state_version)
+    ).scalar_one()
+
+
+def bump_players_version(db: Session, agent_id: int) -> int:
+    """Increment the agent's player-list version and return the new value."""
+
+    return db.execute(
+        update(models.Agent)
+        .where(models.Agent.id == agent_id)
+        .values(players_version=models.Agent.players_version + 1)
+        .returning(models.Agent.players_version)
+    ).scalar_one()
+
+
+def event_etag(event_id: int, version: int) -> str:
+    return f'W/"e{event_id}.{version}"'
+
+
+def players_etag(agent_id: int, version: int, event_id: Optional[int] = None, event_version: Optional[int] = None) -> str:
+    if event_id is None:
+        return f'W/"a{agent_id}.{version}"'
+    # Lists filtered by event registration also change with the event.
+    return f'W/"a{agent_id}.{version}.e{event_id}.{event_version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(",")}
+    if "*" in candidates:
+        return True
+    # Weak comparison: W/"x" and "x" are equivalent for If-None-Match.
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return etag in candidates or bare in candidates or f"W/{bare}" in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let browsers keep the body but revalidate on every poll.
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,78 @@
+-- The schema as the models created it before app.migrations existed (SQLite
+-- dialect), for tests/test_migrations.py. Do not update it with new models.
+
+CREATE TABLE agent (
+	id INTEGER NOT NULL, 
+	full_name VARCHAR NOT NULL, 
+	email VARCHAR NOT NULL, 
+	password_hash VARCHAR NOT NULL, 
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, 
+	api_token VARCHAR, 
+	PRIMARY KEY (id), 
+	UNIQUE (email), 
+	UNIQUE (api_token)
+);
+
+CREATE TABLE assignment (
+	id INTEGER NOT NULL, 
+	event_id INTEGER NOT NULL, 
+	table_id INTEGER, 
+	player1_id INTEGER NOT NULL, 
+	player2_id INTEGER NOT NULL, 
+	status VARCHAR NOT NULL, 
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, 
+	notified_at DATETIME, 
+	started_at DATETIME, 
+	ended_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(event_id) REFERENCES event (id) ON DELETE CASCADE, 
+	FOREIGN KEY(table_id) REFERENCES "table" (id) ON DELETE SET NULL, 
+	FOREIGN KEY(player1_id) REFERENCES player (id) ON DELETE RESTRICT, 
+	FOREIGN KEY(player2_id) REFERENCES player (id) ON DELETE RESTRICT
+);
+
+CREATE TABLE "table" (
+	id INTEGER NOT NULL, 
+	event_id INTEGER NOT NULL, 
+	status VARCHAR NOT NULL, 
+	current_assignment_id INTEGER, 
+	position INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT uq_table_event_position UNIQUE (event_id, position), 
+	FOREIGN KEY(event_id) REFERENCES event (id) ON DELETE CASCADE, 
+	FOREIGN KEY(current_assignment_id) REFERENCES assignment (id) ON DELETE SET NULL
+);
+
+CREATE TABLE event (
+	id INTEGER NOT NULL, 
+	agent_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	tables_count INTEGER NOT NULL, 
+	starts_at DATETIME, 
+	location VARCHAR, 
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(agent_id) REFERENCES agent (id) ON DELETE CASCADE
+);
+
+CREATE TABLE player (
+	id INTEGER NOT NULL, 
+	agent_id INTEGER NOT NULL, 
+	full_name VARCHAR NOT NULL, 
+	phone_number VARCHAR, 
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT un_agent_phone_number UNIQUE (agent_id, phone_number), 
+	FOREIGN KEY(agent_id) REFERENCES agent (id) ON DELETE CASCADE
+);
+
+CREATE TABLE registration (
+	id INTEGER NOT NULL, 
+	event_id INTEGER NOT NULL, 
+	player_id INTEGER NOT NULL, 
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT un_event_player UNIQUE (event_id, player_id), 
+	FOREIGN KEY(event_id) REFERENCES event (id) ON DELETE CASCADE, 
+	FOREIGN KEY(player_id) REFERENCES player (id) ON DELETE CASCADE
+);
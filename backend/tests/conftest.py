@@ -0,0 +1,90 @@
+# backend/tests/conftest.py
+"""Shared fixtures: an in-memory SQLite schema built from the models.
+
+Nothing here talks to the app's configured database; tests call query
+helpers and route functions directly with the ``db`` session.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.db import Base
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine, autoflush=False) as session:
+        yield session
+
+
+class QueryCounter:
+    """Counts statements sent to the database while active."""
+
+    def __init__(self):
+        self.count = 0
+        self.active = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        self.active = True
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+
+
+@pytest.fixture
+def count_queries(engine):
+    """``with count_queries() as counter: ...`` then check ``counter.count``."""
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield lambda: counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def agent(db):
+    agent = models.Agent(full_name="Agent", email="agent@example.com", password_hash="x", api_token="token")
+    db.add(agent)
+    db.flush()
+    return agent
+
+
+@pytest.fixture
+def make_event(db, agent):
+    def make_event(name="Event"):
+        ev = models.Event(agent_id=agent.id, name=name, tables_count=0)
+        db.add(ev)
+        db.flush()
+        return ev
+
+    return make_event
+
+
+@pytest.fixture
+def make_players(db, agent):
+    def make_players(n):
+        players = [
+            models.Player(agent_id=agent.id, full_name=f"Player {i}", phone_number=f"69{i:08d}", phone_e164=f"+3069{i:08d}")
+            for i in range(n)
+        ]
+        db.add_all(players)
+        db.flush()
+        return players
+
+    return make_players
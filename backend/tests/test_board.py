@@ -0,0 +1,81 @@
+# backend/tests/test_board.py
+import pytest
+from sqlalchemy import func
+
+from app import board, models
+from app.board import board_rows
+from app.versioning import bump_event_version
+
+
+def _seed_board(db, event, players, n_tables):
+    """``n_tables`` tables, every other one occupied by a pair of ``players``.
+
+    Returns the event id; the session is left empty so reads start cold.
+    """
+    event_id = event.id
+    pairs = iter(zip(players[::2], players[1::2]))
+    for position in range(1, n_tables + 1):
+        table = models.Table(event_id=event.id, position=position, status="free")
+        db.add(table)
+        db.flush()
+        if position % 2:
+            p1, p2 = next(pairs)
+            assignment = models.Assignment(
+                event_id=event.id, table_id=table.id, player1_id=p1.id, player2_id=p2.id, status="active"
+            )
+            db.add(assignment)
+            db.flush()
+            table.status = "occupied"
+            table.current_assignment_id = assignment.id
+    db.commit()
+    db.expunge_all()
+    return event_id
+
+
+@pytest.mark.parametrize("n_tables", [1, 10, 100])
+def test_board_is_one_query_regardless_of_table_count(db, make_event, make_players, count_queries, n_tables):
+    event_id = _seed_board(db, make_event(), make_players(n_tables + 1), n_tables)
+
+    with count_queries() as counter:
+        rows = board_rows(db, event_id)
+        # Serialising must not lazy-load the players either.
+        [row.model_dump() for row in rows]
+
+    assert len(rows) == n_tables
+    occupied = [row for row in rows if row.current_assignment_id is not None]
+    assert len(occupied) == (n_tables + 1) // 2
+    assert all(row.player1 is not None and row.player2 is not None for row in occupied)
+    assert counter.count == 1
+
+
+def test_board_rows_for_given_tables(db, make_event, make_players, count_queries):
+    event_id = _seed_board(db, make_event(), make_players(20), 10)
+    wanted = [row.id for row in board_rows(db, event_id)][2:5]
+    db.expunge_all()
+
+    with count_queries() as counter:
+        rows = board_rows(db, event_id, wanted)
+
+    assert [row.id for row in rows] == wanted
+    assert counter.count == 1
+
+
+def test_change_log_is_compacted_when_other_writes_skip_versions(db, make_event, monkeypatch):
+    monkeypatch.setattr(board, "BOARD_LOG_RETENTION", 10)
+    monkeypatch.setattr(board, "BOARD_LOG_COMPACT_EVERY", 2)
+    event = make_event()
+    db.add(models.Table(event_id=event.id, position=1, status="free"))
+    bump_event_version(db, event.id)
+    db.flush()
+
+    # Board changes land on odd versions only, never on a multiple of 2.
+    for _ in range(60):
+        bump_event_version(db, event.id)  # a registration: no board change, skips a version
+        board.record_board_change(db, event.id)
+        db.commit()
+
+    db.refresh(event)
+    assert event.state_version == 121
+    assert 121 - 10 - 2 < event.changes_floor <= 121 - 10
+    oldest = db.query(func.min(models.BoardChange.version)).filter(models.BoardChange.event_id == event.id).scalar()
+    assert oldest > event.changes_floor
@@ -0,0 +1,31 @@
+# backend/tests/test_event_access_cache.py
+import pytest
+
+from app import pubsub, security
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    security._forget_all()
+    yield
+    security._forget_all()
+
+
+def test_forget_event_drops_every_owner_here_and_publishes(db, monkeypatch):
+    published = []
+    monkeypatch.setattr(pubsub, "notify", lambda db, channel, payload: published.append((channel, payload)))
+    security._remember_ownership(1, 7)
+    security._remember_ownership(2, 7)
+    security._remember_ownership(1, 8)
+
+    security.forget_event(db, 7)
+
+    assert not security._owns_event(1, 7) and not security._owns_event(2, 7)
+    assert security._owns_event(1, 8)
+    assert published == [(security.EVENT_ACCESS_CHANNEL, "7")]
+
+
+def test_eviction_from_another_worker_is_applied():
+    security._remember_ownership(1, 7)
+    pubsub._dispatch(security.EVENT_ACCESS_CHANNEL, "7")
+    assert not security._owns_event(1, 7)
@@ -0,0 +1,41 @@
+# backend/tests/test_import_jobs.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.routers import players
+
+
+@pytest.fixture
+def job_session(engine, monkeypatch):
+    monkeypatch.setattr(players, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(players, "_local_jobs", set())
+
+
+def _job(db, agent, status, idle_seconds):
+    job = models.ImportJob(
+        agent_id=agent.id,
+        status=status,
+        updated_at=datetime.now(timezone.utc) - timedelta(seconds=idle_seconds),
+    )
+    db.add(job)
+    db.flush()
+    return job.id
+
+
+def test_only_jobs_without_a_heartbeat_are_failed_at_startup(db, agent, job_session):
+    waiting_here = _job(db, agent, "queued", 3600)  # behind another job on a live process
+    orphaned = _job(db, agent, "running", 3600)
+    recent = _job(db, agent, "queued", 10)
+    done = _job(db, agent, "completed", 3600)
+    db.commit()
+    players._local_jobs.add(waiting_here)
+
+    players._touch_local_jobs()
+    assert players.fail_stale_import_jobs() == 1
+
+    db.expire_all()
+    status = {job_id: db.get(models.ImportJob, job_id).status for job_id in (waiting_here, orphaned, recent, done)}
+    assert status == {waiting_here: "queued", orphaned: "failed", recent: "queued", done: "completed"}
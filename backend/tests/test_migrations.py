@@ -0,0 +1,61 @@
+# backend/tests/test_migrations.py
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.db import Base
+
+BASELINE_SCHEMA = Path(__file__).with_name("baseline_schema.sql")
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    path = tmp_path / "baseline.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA.read_text())
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def _schema_differences(engine):
+    inspector = inspect(engine)
+    missing = []
+    for table in Base.metadata.tables.values():
+        if not inspector.has_table(table.name):
+            missing.append(table.name)
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing += [f"{table.name}.{column.name}" for column in table.columns if column.name not in columns]
+        indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        indexes.update(uc["name"] for uc in inspector.get_unique_constraints(table.name))
+        wanted = [ix.name for ix in table.indexes]
+        wanted += [c.name for c in table.constraints if c.name and c.name.startswith(("un_", "uq_"))]
+        missing += [f"{table.name}: {name}" for name in wanted if name not in indexes]
+    return missing
+
+
+def test_baseline_database_is_brought_up_to_the_models(baseline_engine):
+    assert migrations.upgrade(baseline_engine) == migrations.available()
+    assert _schema_differences(baseline_engine) == []
+
+    with Session(baseline_engine) as db:
+        for mapper in Base.registry.mappers:
+            db.execute(select(mapper.class_).limit(1)).all()
+
+
+def test_upgrade_is_idempotent(baseline_engine):
+    migrations.upgrade(baseline_engine)
+    assert migrations.upgrade(baseline_engine) == []
+
+
+def test_fresh_database_is_created_and_stamped(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert migrations.upgrade(engine) == migrations.available()
+    assert _schema_differences(engine) == []
+    assert migrations.upgrade(engine) == []
+    engine.dispose()
@@ -0,0 +1,28 @@
+# backend/tests/test_player_import.py
+import pytest
+from sqlalchemy.dialects import sqlite
+
+from app import models
+from app.routers import players
+
+
+@pytest.fixture(autouse=True)
+def sqlite_insert(monkeypatch):
+    # The importer builds Postgres INSERT ... ON CONFLICT; SQLite has the same construct.
+    monkeypatch.setattr(players, "insert", sqlite.insert)
+
+
+def _row(agent, i, full_name="Player"):
+    return (i + 2, {"agent_id": agent.id, "full_name": full_name, "phone_number": None, "phone_e164": None})
+
+
+def test_failed_batch_keeps_good_rows_and_reports_only_bad_ones(db, agent):
+    batch = [_row(agent, i, full_name=None if i in (3, 7) else f"Player {i}") for i in range(10)]
+    errors = []
+
+    created = players._insert_player_batch(db, agent.id, batch, errors)
+
+    assert created == 8
+    assert db.query(models.Player).count() == 8
+    assert [error.split(":")[0] for error in errors] == ["Row 5", "Row 9"]
+    assert all("could not be saved" in error and "INSERT" not in error for error in errors)
@@ -0,0 +1,54 @@
+# backend/tests/test_player_search.py
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import player_search
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(player_search, "_indexes", player_search.OrderedDict())
+    monkeypatch.setattr(player_search, "_build_locks", {})
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    def slow_load(db, agent):
+        calls.append(agent.players_version)
+        time.sleep(0.05)  # long enough for every search to arrive during the build
+        return player_search._AgentIndex(agent.players_version, [(1, "Γιώργος Παπαδόπουλος", "6900000000")], [None])
+
+    monkeypatch.setattr(player_search, "_load", slow_load)
+    return calls
+
+
+def test_concurrent_searches_share_one_rebuild(loads):
+    agent = SimpleNamespace(id=1, players_version=3)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(player_search.search_players(None, agent, "γιω")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [3]
+    assert len(results) == 8 and all(hits == [(1, "Γιώργος Παπαδόπουλος", "6900000000")] for hits in results)
+
+
+def test_new_version_rebuilds_once(loads):
+    agent = SimpleNamespace(id=1, players_version=3)
+    player_search.search_players(None, agent, "γιω")
+    player_search.search_players(None, agent, "παπ")
+    agent.players_version = 4
+    player_search.search_players(None, agent, "γιω")
+    player_search.search_players(None, SimpleNamespace(id=1, players_version=3), "γιω")  # older reader
+
+    assert loads == [3, 4]
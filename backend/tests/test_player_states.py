@@ -0,0 +1,27 @@
+# backend/tests/test_player_states.py
+from app import models
+from app.routers.players import _player_state_payload, _player_states_query, _state_row
+
+
+def test_player_in_a_match_is_playing_even_if_not_registered(db, make_event, make_players):
+    event = make_event()
+    registered, unregistered, opponent = make_players(3)
+    db.add(models.Registration(event_id=event.id, player_id=registered.id))
+    table = models.Table(event_id=event.id, position=1, status="occupied")
+    db.add(table)
+    db.flush()
+    db.add(
+        models.Assignment(
+            event_id=event.id, table_id=table.id, player1_id=unregistered.id, player2_id=opponent.id, status="active"
+        )
+    )
+    db.flush()
+
+    state = _player_state_payload(db, event.id, unregistered)
+    assert state.state == "playing"
+    assert state.table_position == 1
+    assert state.opponent.id == opponent.id
+    assert _player_state_payload(db, event.id, registered).state == "free"
+
+    listed = [_state_row(*row) for row in db.execute(_player_states_query(event.id))]
+    assert [(s.player.id, s.state) for s in listed] == [(registered.id, "free")]
@@ -0,0 +1,67 @@
+# backend/tests/test_registrations.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Response
+
+from app import models, schemas
+from app.pagination import NEXT_CURSOR_HEADER
+from app.routers.registrations import list_registrations
+
+N_REGISTRATIONS = 1000
+
+
+@pytest.fixture
+def registered_event(db, agent, make_event, make_players):
+    event_id = make_event().id
+    # Explicit timestamps: SQLite's CURRENT_TIMESTAMP text does not compare
+    # with bound datetimes the way Postgres timestamps do.
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.add_all(
+        models.Registration(event_id=event_id, player_id=p.id, created_at=start + timedelta(seconds=i // 2))
+        for i, p in enumerate(make_players(N_REGISTRATIONS))
+    )
+    db.commit()
+    db.expunge_all()
+    return event_id
+
+
+def _list(db, agent, event_id, response=None, **params):
+    params = {"limit": None, "cursor": None, "name": None, "view": "full", **params}
+    return list_registrations(response or Response(), event_id=event_id, db=db, current_agent=agent, **params)
+
+
+@pytest.mark.parametrize(
+    "view, schema", [("full", schemas.RegistrationOut), ("slim", schemas.RegistrationSlimOut)]
+)
+def test_list_is_one_query_for_all_registrations(db, agent, registered_event, count_queries, view, schema):
+    with count_queries() as counter:
+        rows = _list(db, agent, registered_event, view=view)
+        # What the response model does: players must not lazy-load per row.
+        out = [schema.model_validate(row).model_dump() for row in rows]
+
+    assert len(out) == N_REGISTRATIONS
+    if view == "full":
+        assert all(item["player"]["full_name"] for item in out)
+    else:
+        assert all(item["full_name"] for item in out)
+    assert counter.count == 1
+
+
+def test_each_page_is_one_query(db, agent, registered_event, count_queries):
+    seen = set()
+    cursor = None
+    for _ in range(N_REGISTRATIONS // 300 + 1):
+        response = Response()
+        with count_queries() as counter:
+            rows = _list(db, agent, registered_event, response=response, limit=300, cursor=cursor)
+            [schemas.RegistrationOut.model_validate(row).model_dump() for row in rows]
+        assert counter.count == 1
+        seen.update(row.id for row in rows)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+    else:
+        pytest.fail("pagination did not reach the last page")
+
+    assert len(seen) == N_REGISTRATIONS
@@ -0,0 +1,42 @@
+# backend/tests/test_scheduler.py
+from app import models
+from app.scheduler import fill_table
+
+
+def test_fill_table_prunes_skips_and_seats_in_queue_order(db, make_event, make_players):
+    event = make_event()
+    left, playing, a, b, c, d = make_players(6)
+    db.add_all(models.Registration(event_id=event.id, player_id=p.id) for p in (playing, a, b, c, d))
+    busy_table = models.Table(event_id=event.id, position=1, status="occupied")
+    free_table = models.Table(event_id=event.id, position=2, status="free")
+    db.add_all([busy_table, free_table])
+    db.flush()
+    db.add(
+        models.Assignment(event_id=event.id, table_id=busy_table.id, player1_id=playing.id, player2_id=d.id, status="active")
+    )
+    queued = [
+        models.QueuedMatch(event_id=event.id, player1_id=left.id, player2_id=a.id, notify=False),  # left the event
+        models.QueuedMatch(event_id=event.id, player1_id=playing.id, player2_id=b.id, notify=False),  # still playing
+        models.QueuedMatch(event_id=event.id, player1_id=b.id, player2_id=c.id, notify=False),
+        models.QueuedMatch(event_id=event.id, player1_id=a.id, player2_id=c.id, notify=False),
+    ]
+    db.add_all(queued)
+    db.flush()
+
+    assignment = fill_table(db, event.id, free_table)
+
+    assert (assignment.player1_id, assignment.player2_id) == (b.id, c.id)
+    assert free_table.status == "occupied"
+    assert [entry.status for entry in queued] == ["cancelled", "waiting", "assigned", "waiting"]
+
+
+def test_fill_table_without_eligible_pairs_seats_nobody(db, make_event, make_players):
+    event = make_event()
+    left, other = make_players(2)
+    table = models.Table(event_id=event.id, position=1, status="free")
+    db.add(table)
+    db.add(models.QueuedMatch(event_id=event.id, player1_id=left.id, player2_id=other.id, notify=False))
+    db.flush()
+
+    assert fill_table(db, event.id, table) is None
+    assert table.status == "free"
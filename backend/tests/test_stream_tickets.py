@@ -0,0 +1,32 @@
+# backend/tests/test_stream_tickets.py
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.security import get_stream_agent_id, issue_stream_ticket
+
+
+def test_ticket_authenticates_its_agent_for_its_event():
+    assert get_stream_agent_id(event_id=7, ticket=issue_stream_ticket(3, 7)) == 3
+
+
+@pytest.mark.parametrize(
+    "event_id, ticket",
+    [
+        (8, issue_stream_ticket(3, 7)),  # another event
+        (7, issue_stream_ticket(3, 7).replace("3.", "4.", 1)),  # another agent
+        (7, "not-a-ticket"),
+        (7, "3.7.9999999999.forged"),
+    ],
+)
+def test_other_tickets_are_refused(event_id, ticket):
+    with pytest.raises(HTTPException) as exc:
+        get_stream_agent_id(event_id=event_id, ticket=ticket)
+    assert exc.value.status_code == 401
+
+
+def test_expired_ticket_is_refused(monkeypatch):
+    monkeypatch.setattr(settings, "BOARD_STREAM_TICKET_SECONDS", -1)
+    ticket = issue_stream_ticket(3, 7)
+    with pytest.raises(HTTPException):
+        get_stream_agent_id(event_id=7, ticket=ticket)
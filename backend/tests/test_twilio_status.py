@@ -0,0 +1,50 @@
+# backend/tests/test_twilio_status.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from twilio.request_validator import RequestValidator
+
+from app import twilio_status
+from app.twilio_conf import TwilioSettings
+
+CALLBACK_URL = "https://pingpong.example/twilio/status"
+FORM = {"MessageSid": "SM123", "MessageStatus": "delivered", "To": "+306900000000"}
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    cfg = TwilioSettings(TWILIO_AUTH_TOKEN="secret", BASE_URL="https://pingpong.example/")
+    monkeypatch.setattr(twilio_status, "get_twilio_settings", lambda: cfg)
+    calls = []
+    monkeypatch.setattr(twilio_status.status_writer, "record", lambda *args: calls.append(args))
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(twilio_status.router)
+    return TestClient(app)
+
+
+def test_signed_callback_is_recorded(client, recorded):
+    signature = RequestValidator("secret").compute_signature(CALLBACK_URL, FORM)
+    response = client.post("/twilio/status", data=FORM, headers={"X-Twilio-Signature": signature})
+    assert response.status_code == 200
+    assert recorded == [("SM123", "delivered", "+306900000000", None)]
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Twilio-Signature": "forged"}])
+def test_unsigned_callback_is_refused(client, recorded, headers):
+    response = client.post("/twilio/status", data=FORM, headers=headers)
+    assert response.status_code == 403
+    assert recorded == []
+
+
+def test_tampered_callback_is_refused(client, recorded):
+    signature = RequestValidator("secret").compute_signature(CALLBACK_URL, FORM)
+    response = client.post(
+        "/twilio/status", data={**FORM, "MessageStatus": "failed"}, headers={"X-Twilio-Signature": signature}
+    )
+    assert response.status_code == 403
+    assert recorded == []
@@ -1,8 +1,79 @@
+import { useEffect, useState } from "react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { api } from "@/api/client";
+import { useAuthStore } from "@/store/authStore";
 import type { Player, TableEntity } from "@/types";
 
+type BoardMessage = { version: number | null; resync?: boolean; tables?: TableEntity[] };
+
+// Keeps the ["tables", eventId] cache in sync with the board's SSE stream.
+// Returns whether the stream is connected so callers can stop polling.
+function useBoardStream(eventId?: string | number) {
+  const qc = useQueryClient();
+  const token = useAuthStore((s) => s.token);
+  const [live, setLive] = useState(false);
+
+  useEffect(() => {
+    if (!eventId || !token || typeof EventSource === "undefined") return;
+    const key = ["tables", eventId];
+    let source: EventSource | undefined;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+
+    // The stream URL carries a short-lived ticket for this event, never the API token.
+    // EventSource retries dropped connections by itself with the same URL; once the
+    // ticket has expired that fails for good, so connect again with a new one.
+    const connect = async () => {
+      let ticket: string;
+      try {
+        ({ ticket } = await api.post<{ ticket: string }>(`/events/${eventId}/tables/board/stream-ticket`));
+      } catch {
+        if (!closed) retry = setTimeout(connect, 5000);
+        return;
+      }
+      if (closed) return;
+      const es = new EventSource(
+        `/api/events/${eventId}/tables/board/stream?ticket=${encodeURIComponent(ticket)}`
+      );
+      source = es;
+
+      es.addEventListener("snapshot", (e) => {
+        const msg = JSON.parse((e as MessageEvent).data) as BoardMessage;
+        qc.setQueryData<TableEntity[]>(key, msg.tables ?? []);
+        setLive(true);
+      });
+      es.addEventListener("delta", (e) => {
+        const msg = JSON.parse((e as MessageEvent).data) as BoardMessage;
+        const changed = new Map((msg.tables ?? []).map((t) => [t.id, t] as const));
+        qc.setQueryData<TableEntity[]>(key, (prev) =>
+          prev ? prev.map((t) => changed.get(t.id) ?? t) : prev
+        );
+      });
+      es.addEventListener("resync", () => {
+        qc.invalidateQueries({ queryKey: key });
+      });
+      es.onerror = () => {
+        setLive(false);
+        if (es.readyState === EventSource.CLOSED && !closed) {
+          retry = setTimeout(connect, 5000);
+        }
+      };
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      source?.close();
+      setLive(false);
+    };
+  }, [eventId, token, qc]);
+
+  return live;
+}
+
 export function useTables(eventId?: string | number) {
+  const live = useBoardStream(eventId);
   return useQuery({
     queryKey: ["tables", eventId],
     queryFn: () => {
@@ -10,7 +81,8 @@ export function useTables(eventId?: string | number) {
       return api.get<TableEntity[]>(`/events/${eventId}/tables/board`);
     },
     enabled: Boolean(eventId),
-    refetchInterval: 5000
+    // Fall back to polling only while the live stream is down.
+    refetchInterval: live ? false : 5000
   });
 }
 